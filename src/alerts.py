@@ -0,0 +1,260 @@
+"""
+Delinquency and expiry alerts for the Real Estate Database
+UpcomingEvent holds one dated row per rent due date, lease and renewal expiry,
+insurance expiry, document expiry and scheduled inspection, indexed by date so any
+window is a single index range scan. Refreshes are incremental: each source
+remembers the highest id it has ingested in AlertWatermark
+
+    python src/alerts.py refresh
+    python src/alerts.py upcoming --days 90
+    python src/alerts.py delinquent --month 2026-10
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from db import DB_PATH, connect
+
+# kind -> (source table, date column, amount expression, property expression);
+# every source has an id
+EXPIRY_SOURCES = {
+    "lease_expiry": ("Lease", "end_date", "rent", "property_id"),
+    "renewal_expiry": (
+        "LeaseRenewal",
+        "new_end_date",
+        "new_rent",
+        "(SELECT property_id FROM Lease WHERE Lease.id = LeaseRenewal.lease_id)",
+    ),
+    "insurance_expiry": ("Insurance", "end_date", "premium_amount", "property_id"),
+    "document_expiry": ("PropertyDocument", "expiry_date", "NULL", "property_id"),
+    "inspection_due": ("Inspection", "next_inspection_date", "NULL", "property_id"),
+}
+
+EVENT_KINDS = ["rent_due", *EXPIRY_SOURCES]
+
+# one rent_due event per month of each lease term (the original lease and each
+# renewal), on the term's start day clamped to the length of short months,
+# matching how create_db.py schedules payments. As in statements.py a term
+# stops billing in the month the lease's next term starts. Terms are picked
+# up by id: leases above :lease_high_water, renewals above :renewal_high_water
+RENT_DUE_SQL = """
+INSERT OR IGNORE INTO UpcomingEvent (event_date, kind, source_id, property_id, amount, paid)
+WITH RECURSIVE terms AS (
+    SELECT id AS lease_id, id AS term_id, property_id, 0 AS renewal,
+           start_date, end_date, rent
+    FROM Lease
+    UNION ALL
+    SELECT r.lease_id, r.id, l.property_id, 1, r.renewal_date, r.new_end_date, r.new_rent
+    FROM LeaseRenewal r
+    JOIN Lease l ON l.id = r.lease_id
+),
+billed AS (
+    SELECT lease_id, property_id, start_date, end_date, rent, stop_date
+    FROM (
+        SELECT *, date(LEAD(start_date) OVER (
+                   PARTITION BY lease_id ORDER BY start_date, renewal, term_id
+               ), 'start of month') AS stop_date
+        FROM terms
+    )
+    WHERE (renewal = 0 AND term_id > :lease_high_water)
+       OR (renewal = 1 AND term_id > :renewal_high_water)
+),
+due(lease_id, property_id, n, start_date, end_date, stop_date, day, rent, due_date) AS (
+    SELECT lease_id, property_id, 0, start_date, end_date, stop_date,
+           CAST(strftime('%d', start_date) AS INTEGER), rent, start_date
+    FROM billed
+    UNION ALL
+    SELECT lease_id, property_id, n + 1, start_date, end_date, stop_date, day, rent,
+           MIN(
+               date(start_date, 'start of month', '+' || (n + 1) || ' months',
+                    '+' || (day - 1) || ' days'),
+               date(start_date, 'start of month', '+' || (n + 2) || ' months', '-1 day')
+           )
+    FROM due
+    WHERE due_date <= end_date AND (stop_date IS NULL OR due_date < stop_date)
+)
+SELECT due_date, 'rent_due', lease_id, property_id, rent, 0
+FROM due
+WHERE due_date <= end_date AND (stop_date IS NULL OR due_date < stop_date)
+"""
+
+# each new payment is credited to the latest rent due date on or before it
+APPLY_PAYMENTS_SQL = """
+UPDATE UpcomingEvent SET paid = paid + applied.total
+FROM (
+    SELECT (
+        SELECT e.id FROM UpcomingEvent e
+        WHERE e.kind = 'rent_due' AND e.source_id = p.lease_id
+          AND e.event_date <= p.payment_date
+        ORDER BY e.event_date DESC
+        LIMIT 1
+    ) AS event_id,
+    SUM(p.amount) AS total
+    FROM Payment p
+    WHERE p.id > :high_water
+    GROUP BY event_id
+) AS applied
+WHERE UpcomingEvent.id = applied.event_id
+"""
+
+
+def create_alert_tables(conn):
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS UpcomingEvent (
+        id INTEGER PRIMARY KEY,
+        event_date DATE NOT NULL,
+        kind TEXT NOT NULL,
+        source_id INTEGER NOT NULL,
+        property_id INTEGER,
+        amount REAL,
+        paid REAL,
+        UNIQUE(source_id, kind, event_date),
+        FOREIGN KEY(property_id) REFERENCES Property(id)
+    )"""
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_upcomingevent_date ON UpcomingEvent (event_date, kind)"
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS AlertWatermark (
+        source TEXT PRIMARY KEY,
+        high_water INTEGER NOT NULL
+    )"""
+    )
+
+
+def drop_alert_tables(conn):
+    conn.execute("DROP TABLE IF EXISTS UpcomingEvent")
+    conn.execute("DROP TABLE IF EXISTS AlertWatermark")
+
+
+def _high_water(conn, source):
+    row = conn.execute(
+        "SELECT high_water FROM AlertWatermark WHERE source = ?", (source,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _advance(conn, source, table):
+    conn.execute(
+        f"""INSERT INTO AlertWatermark (source, high_water)
+        SELECT ?, COALESCE(MAX(id), 0) FROM {table} WHERE true
+        ON CONFLICT(source) DO UPDATE SET high_water = excluded.high_water""",
+        (source,),
+    )
+
+
+def refresh_alerts(conn, full=False):
+    """Ingest source rows added since the last refresh and return the number
+    of events added. full=True rebuilds from scratch, which also picks up
+    edits to rows that were already ingested and cuts short terms that a
+    later renewal starts inside of.
+    """
+    if full:
+        drop_alert_tables(conn)
+    create_alert_tables(conn)
+    before = conn.execute("SELECT COUNT(*) FROM UpcomingEvent").fetchone()[0]
+
+    conn.execute(
+        RENT_DUE_SQL,
+        {
+            "lease_high_water": _high_water(conn, "rent_due"),
+            "renewal_high_water": _high_water(conn, "renewal_due"),
+        },
+    )
+    _advance(conn, "rent_due", "Lease")
+    _advance(conn, "renewal_due", "LeaseRenewal")
+
+    for kind, (table, date_column, amount, property_id) in EXPIRY_SOURCES.items():
+        conn.execute(
+            f"""INSERT OR IGNORE INTO UpcomingEvent
+            (event_date, kind, source_id, property_id, amount, paid)
+            SELECT {date_column}, ?, id, {property_id}, {amount}, NULL
+            FROM {table}
+            WHERE id > ? AND {date_column} IS NOT NULL""",
+            (kind, _high_water(conn, kind)),
+        )
+        _advance(conn, kind, table)
+
+    # payments go last so rent due dates for new terms already exist
+    conn.execute(APPLY_PAYMENTS_SQL, {"high_water": _high_water(conn, "payment")})
+    _advance(conn, "payment", "Payment")
+
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM UpcomingEvent").fetchone()[0] - before
+
+
+def upcoming(conn, start, end, kinds=None):
+    """Events dated start..end (inclusive) as (event_date, kind, source_id,
+    property_id, amount, paid) rows, earliest first
+    """
+    sql = """SELECT event_date, kind, source_id, property_id, amount, paid
+        FROM UpcomingEvent
+        WHERE event_date BETWEEN ? AND ?"""
+    params = [str(start), str(end)]
+    if kinds:
+        sql += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        params.extend(kinds)
+    return conn.execute(sql + " ORDER BY event_date, kind", params).fetchall()
+
+
+def delinquent(conn, month=None):
+    """Rent due dates in month ('YYYY-MM', default this month) that are not
+    fully paid, as (event_date, lease_id, property_id, amount, paid) rows
+    """
+    month = month or date.today().strftime("%Y-%m")
+    return conn.execute(
+        """SELECT event_date, source_id, property_id, amount, paid
+        FROM UpcomingEvent
+        WHERE event_date BETWEEN date(?) AND date(?, '+1 month', '-1 day')
+          AND kind = 'rent_due' AND paid < amount
+        ORDER BY event_date""",
+        (f"{month}-01", f"{month}-01"),
+    ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delinquency and expiry alerts")
+    parser.add_argument("--db", default=DB_PATH, help="database to use")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh_cmd = commands.add_parser("refresh", help="ingest new source rows")
+    refresh_cmd.add_argument("--full", action="store_true", help="rebuild from scratch")
+
+    upcoming_cmd = commands.add_parser("upcoming", help="events in the next N days")
+    upcoming_cmd.add_argument("--days", type=int, default=90, help="window length")
+    upcoming_cmd.add_argument("--kind", action="append", choices=EVENT_KINDS)
+
+    delinquent_cmd = commands.add_parser("delinquent", help="unpaid rent in a month")
+    delinquent_cmd.add_argument("--month", help="YYYY-MM (default: this month)")
+
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        start = time.perf_counter()
+        if args.command == "refresh":
+            added = refresh_alerts(conn, args.full)
+            print(f"Added {added:,} events in {time.perf_counter() - start:.2f}s")
+        elif args.command == "upcoming":
+            today = date.today()
+            rows = upcoming(conn, today, today + timedelta(days=args.days), args.kind)
+            for event_date, kind, source_id, property_id, amount, _ in rows:
+                amount_text = f"  {amount:,.2f}" if amount is not None else ""
+                print(f"{event_date}  {kind:<18}#{source_id:<8} property {property_id}{amount_text}")
+            print(f"\n{len(rows):,} events in {time.perf_counter() - start:.3f}s")
+        elif args.command == "delinquent":
+            rows = delinquent(conn, args.month)
+            for event_date, lease_id, property_id, amount, paid in rows:
+                print(
+                    f"{event_date}  lease #{lease_id:<8} property {property_id:<6}"
+                    f" due {amount:>12,.2f}  paid {paid:>12,.2f}"
+                )
+            print(f"\n{len(rows):,} unpaid in {time.perf_counter() - start:.3f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Output backends for the sample data generator
+generate_tables() produces each table once and the row batches are handed to
+every selected backend, each loading them through its fastest bulk path:
+
+- SQLite: executemany in one transaction per table, with the journal kept in
+  memory and fsync off until the load is done
+- DuckDB: batches staged as CSV and loaded with COPY (the Python API has no
+  row appender without pandas/pyarrow)
+- PostgreSQL: COPY text or binary files plus a load.sql for psql
+
+    python src/backends.py --scale 0.1 --sqlite out.db --pg-text pg_text --pg-binary pg_bin
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import struct
+import tempfile
+import time
+from datetime import date
+from itertools import islice
+
+from create_db import (
+    BATCH_SIZE,
+    column_definitions,
+    columns,
+    create_indexes,
+    finish_build,
+    generate_tables,
+    insert_sql,
+    record_checkpoint,
+    start_build,
+)
+from db import connect
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# declared SQLite type of every column, in `columns` order
+column_types = {
+    table: tuple(kind for _, kind, _ in definitions)
+    for table, definitions in column_definitions.items()
+}
+
+# declared type -> column type in each target
+PG_TYPES = {
+    "INTEGER": "bigint",
+    "REAL": "double precision",
+    "TEXT": "text",
+    "DATE": "date",
+    "BOOLEAN": "boolean",
+}
+
+DUCKDB_TYPES = {
+    "INTEGER": "BIGINT",
+    "REAL": "DOUBLE",
+    "TEXT": "VARCHAR",
+    "DATE": "DATE",
+    "BOOLEAN": "BOOLEAN",
+}
+
+# binary COPY dates count days from 2000-01-01
+PG_EPOCH = date(2000, 1, 1).toordinal()
+
+PG_BINARY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+
+
+def _pg_binary_field(kind, value):
+    if value is None:
+        return b"\xff\xff\xff\xff"
+    if kind == "INTEGER":
+        data = struct.pack("!q", value)
+    elif kind == "REAL":
+        data = struct.pack("!d", value)
+    elif kind == "DATE":
+        data = struct.pack("!i", value.toordinal() - PG_EPOCH)
+    elif kind == "BOOLEAN":
+        data = b"\x01" if value else b"\x00"
+    else:
+        data = str(value).encode()
+    return struct.pack("!i", len(data)) + data
+
+
+def _pg_text_field(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, float):
+        return repr(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _table_ddl(table, types):
+    """CREATE TABLE for table without foreign keys, with types mapped by types"""
+    definitions = [
+        f"{name} {types[kind]}"
+        f"{' PRIMARY KEY' if name == 'id' else ''}{' NOT NULL' if not_null else ''}"
+        for name, kind, not_null in column_definitions[table]
+    ]
+    return f'CREATE TABLE "{table}" (\n    ' + ",\n    ".join(definitions) + "\n);\n"
+
+
+class Backend:
+    """Receives every table as a sequence of row batches, in load order"""
+
+    name = "backend"
+
+    def begin(self, scale, seed_value):
+        pass
+
+    def begin_table(self, table):
+        pass
+
+    def write(self, table, rows):
+        raise NotImplementedError
+
+    def end_table(self, table, row_count):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend(Backend):
+    """The create_db.py database, built through the same start and finish
+    steps as build_database() around the bulk load
+    """
+
+    name = "sqlite"
+
+    def __init__(self, target, indexes=True):
+        self.target = target
+        self.indexes = indexes
+        self.conn = None
+        self.phases = None
+        self.journal_mode = None
+
+    def begin(self, scale, seed_value):
+        directory = os.path.dirname(self.target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = connect(self.target)
+        self.phases = start_build(self.conn, scale, seed_value)
+        # a failed load is rerun from scratch, so skip the rollback journal
+        # and fsyncs while the tables fill; the journal mode the file had
+        # (WAL stays WAL) is put back at the end
+        self.journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.execute("PRAGMA synchronous = OFF")
+
+    def write(self, table, rows):
+        self.conn.executemany(insert_sql(table), rows)
+
+    def end_table(self, table, row_count):
+        record_checkpoint(self.conn, table, row_count, True)
+
+    def close(self):
+        if self.indexes:
+            create_indexes(self.conn, self.phases)
+        finish_build(self.conn, self.phases)
+        self.conn.execute("PRAGMA synchronous = FULL")
+        self.conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        self.conn.close()
+
+
+class DuckDBBackend(Backend):
+    """A DuckDB database file; each table is staged as CSV and COPY-loaded"""
+
+    name = "duckdb"
+
+    def __init__(self, path):
+        if duckdb is None:
+            raise RuntimeError("DuckDB backend needs the duckdb package: pip install duckdb")
+        self.path = path
+        self.conn = None
+        self.staging = None
+        self.file = None
+        self.writer = None
+
+    def begin(self, scale, seed_value):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.conn = duckdb.connect(self.path)
+        for table in columns:
+            self.conn.execute(_table_ddl(table, DUCKDB_TYPES))
+        self.staging = tempfile.mkdtemp(prefix="duckdb_stage_")
+
+    def _stage_path(self, table):
+        return os.path.join(self.staging, f"{table}.csv")
+
+    def begin_table(self, table):
+        self.file = open(self._stage_path(table), "w", newline="")
+        # quoting every string keeps '' apart from NULL, which is left unquoted
+        self.writer = csv.writer(self.file, quoting=csv.QUOTE_NONNUMERIC)
+
+    def write(self, table, rows):
+        self.writer.writerows(
+            tuple(value.isoformat() if isinstance(value, date) else value for value in row)
+            for row in rows
+        )
+
+    def end_table(self, table, row_count):
+        self.file.close()
+        self.conn.execute(
+            f"""COPY "{table}" FROM '{self._stage_path(table)}'
+            (FORMAT csv, HEADER false, ALLOW_QUOTED_NULLS false)"""
+        )
+        os.remove(self._stage_path(table))
+
+    def close(self):
+        self.conn.close()
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+class PgCopyBackend(Backend):
+    """PostgreSQL COPY files (text or binary) and a load.sql that creates the
+    tables and \\copy-loads them: psql -f load.sql from inside the directory
+    """
+
+    def __init__(self, directory, binary=False):
+        self.directory = directory
+        self.binary = binary
+        self.name = "pg-binary" if binary else "pg-text"
+        self.file = None
+
+    def _data_path(self, table):
+        return os.path.join(self.directory, f"{table}.{'bin' if self.binary else 'copy'}")
+
+    def begin(self, scale, seed_value):
+        os.makedirs(self.directory, exist_ok=True)
+        options = " WITH (FORMAT binary)" if self.binary else ""
+        with open(os.path.join(self.directory, "load.sql"), "w") as f:
+            f.write(f"-- sample data at scale {scale:g}, seed {seed_value}\n")
+            for table in columns:
+                f.write(f'DROP TABLE IF EXISTS "{table}";\n')
+                f.write(_table_ddl(table, PG_TYPES))
+            for table in columns:
+                names = ", ".join(columns[table])
+                data = os.path.basename(self._data_path(table))
+                f.write(f"\\copy \"{table}\" ({names}) FROM '{data}'{options}\n")
+
+    def begin_table(self, table):
+        if self.binary:
+            self.file = open(self._data_path(table), "wb")
+            self.file.write(PG_BINARY_SIGNATURE)
+        else:
+            self.file = open(self._data_path(table), "w", newline="\n")
+
+    def write(self, table, rows):
+        if self.binary:
+            kinds = column_types[table]
+            count = struct.pack("!h", len(kinds))
+            self.file.write(
+                b"".join(
+                    count + b"".join(_pg_binary_field(k, v) for k, v in zip(kinds, row))
+                    for row in rows
+                )
+            )
+        else:
+            self.file.write(
+                "".join("\t".join(_pg_text_field(v) for v in row) + "\n" for row in rows)
+            )
+
+    def end_table(self, table, row_count):
+        if self.binary:
+            self.file.write(struct.pack("!h", -1))
+        self.file.close()
+
+
+def generate(backends, scale=1.0, seed_value=None, batch_size=BATCH_SIZE):
+    """Generate every table once and feed each batch to all backends; returns
+    {backend name: seconds spent inside that backend}
+    """
+    if seed_value is None:
+        seed_value = 0
+    spent = {backend.name: 0.0 for backend in backends}
+
+    def timed(backend, method, *args):
+        start = time.perf_counter()
+        method(*args)
+        spent[backend.name] += time.perf_counter() - start
+
+    for backend in backends:
+        timed(backend, backend.begin, scale, seed_value)
+    for table, rows in generate_tables(scale, seed_value):
+        print(f"Creating {table} data...")
+        for backend in backends:
+            timed(backend, backend.begin_table, table)
+        row_count = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            row_count += len(batch)
+            for backend in backends:
+                timed(backend, backend.write, table, batch)
+        for backend in backends:
+            timed(backend, backend.end_table, table, row_count)
+    for backend in backends:
+        timed(backend, backend.close)
+    return spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sample data into one or more backends")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale factor")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the generated data")
+    parser.add_argument("--sqlite", help="SQLite database file to (re)create")
+    parser.add_argument(
+        "--no-indexes", action="store_true", help="skip the SQLite search, market and alert indexes"
+    )
+    parser.add_argument("--duckdb", help="DuckDB database file to (re)create")
+    parser.add_argument("--pg-text", help="directory for PostgreSQL COPY text files")
+    parser.add_argument("--pg-binary", help="directory for PostgreSQL COPY binary files")
+    args = parser.parse_args()
+
+    backends = []
+    if args.sqlite:
+        backends.append(SQLiteBackend(args.sqlite, not args.no_indexes))
+    if args.duckdb:
+        backends.append(DuckDBBackend(args.duckdb))
+    if args.pg_text:
+        backends.append(PgCopyBackend(args.pg_text))
+    if args.pg_binary:
+        backends.append(PgCopyBackend(args.pg_binary, binary=True))
+    if not backends:
+        parser.error("choose at least one of --sqlite, --duckdb, --pg-text, --pg-binary")
+
+    start = time.perf_counter()
+    spent = generate(backends, args.scale, args.seed)
+    total = time.perf_counter() - start
+    print(f"\nGenerated in {total:.2f}s; time spent writing per backend:")
+    for name, seconds in spent.items():
+        print(f"  {name:<10}{seconds:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
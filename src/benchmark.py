@@ -0,0 +1,173 @@
+"""
+Benchmark harness for the standard query workload
+Builds one database per scale factor, runs every workload query cold and warm
+and writes p50/p95 latencies to a JSON file that can be diffed between runs
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import time
+
+from create_db import GENERATOR_VERSION, build_database, built_version
+from db import READ_PROFILE, connect_read, warm_up
+from queries import WORKLOAD
+
+BENCH_DIR = "database/bench"
+RESULTS_PATH = "benchmarks/results.json"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def bench_db_path(scale, seed_value):
+    return os.path.join(
+        BENCH_DIR, f"real_estate_v{GENERATOR_VERSION}_sf{scale:g}_seed{seed_value}.db"
+    )
+
+
+def time_query(conn, sql):
+    """Run sql to completion and return (elapsed ms, row count)"""
+    start = time.perf_counter()
+    rows = conn.execute(sql).fetchall()
+    return (time.perf_counter() - start) * 1000, len(rows)
+
+
+def open_bench(db_path, profile=None):
+    """A plain connection, or one with the read profile applied"""
+    if profile is None:
+        return sqlite3.connect(db_path)
+    return connect_read(db_path, profile)
+
+
+def run_cold(db_path, sql, runs, profile=None):
+    """Each run opens a fresh connection, so SQLite's page cache starts empty"""
+    samples = []
+    for _ in range(runs):
+        conn = open_bench(db_path, profile)
+        try:
+            elapsed, row_count = time_query(conn, sql)
+        finally:
+            conn.close()
+        samples.append(elapsed)
+    return samples, row_count
+
+
+def run_warm(db_path, sql, runs, profile=None):
+    """One untimed warm-up run, then every timed run reuses the connection;
+    with a read profile every table and index is read first as well
+    """
+    conn = open_bench(db_path, profile)
+    try:
+        if profile is not None:
+            warm_up(conn)
+        _, row_count = time_query(conn, sql)
+        samples = [time_query(conn, sql)[0] for _ in range(runs)]
+    finally:
+        conn.close()
+    return samples, row_count
+
+
+def summarize(samples):
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+    }
+
+
+def run_benchmark(scales, runs=10, seed_value=42, rebuild=False, only=None, profile=None):
+    """Return the results dictionary for every scale factor"""
+    results = {"runs": runs, "seed": seed_value, "read_profile": profile, "scale_factors": {}}
+    for scale in scales:
+        db_path = bench_db_path(scale, seed_value)
+        # an interrupted build is left unstamped, so it is built again
+        if rebuild or built_version(db_path) != GENERATOR_VERSION:
+            print(f"Building scale factor {scale:g} at {db_path}...")
+            build_database(db_path, scale, seed_value).close()
+
+        print(f"\nScale factor {scale:g}")
+        print(f"  {'query':<34}{'rows':>8}{'cold p50':>11}{'cold p95':>11}{'warm p50':>11}{'warm p95':>11}")
+        queries = {}
+        for name, sql in WORKLOAD:
+            if only and name not in only:
+                continue
+            cold, row_count = run_cold(db_path, sql, runs, profile)
+            warm, _ = run_warm(db_path, sql, runs, profile)
+            queries[name] = {
+                "rows": row_count,
+                "cold": summarize(cold),
+                "warm": summarize(warm),
+            }
+            q = queries[name]
+            print(
+                f"  {name:<34}{row_count:>8}"
+                f"{q['cold']['p50_ms']:>11.2f}{q['cold']['p95_ms']:>11.2f}"
+                f"{q['warm']['p50_ms']:>11.2f}{q['warm']['p95_ms']:>11.2f}"
+            )
+        results["scale_factors"][f"{scale:g}"] = {
+            "db_bytes": os.path.getsize(db_path),
+            "queries": queries,
+        }
+    return results
+
+
+def compare(baseline, results):
+    """Print warm p50 changes against a previous results file"""
+    print("\nWarm p50 vs baseline:")
+    for scale, current in results["scale_factors"].items():
+        previous = baseline.get("scale_factors", {}).get(scale)
+        if previous is None:
+            continue
+        for name, q in current["queries"].items():
+            before = previous["queries"].get(name)
+            if before is None or not before["warm"]["p50_ms"]:
+                continue
+            ratio = q["warm"]["p50_ms"] / before["warm"]["p50_ms"]
+            print(f"  sf{scale} {name:<34}{ratio:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the standard query workload")
+    parser.add_argument(
+        "--scales", type=float, nargs="+", default=[0.1, 1.0], help="scale factors to run"
+    )
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per query and mode")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the generated data")
+    parser.add_argument("--rebuild", action="store_true", help="regenerate the databases")
+    parser.add_argument("--query", action="append", help="only run the named query")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON results file")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument(
+        "--read-profile",
+        action="store_true",
+        help="apply the read profile to every connection and warm up before warm runs",
+    )
+    args = parser.parse_args()
+
+    profile = dict(READ_PROFILE) if args.read_profile else None
+    results = run_benchmark(
+        args.scales, args.runs, args.seed, args.rebuild, args.query, profile
+    )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), results)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # sorted keys and fixed rounding keep the file stable for diffs
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Change data capture for the Real Estate Database
+Triggers on the data tables append one compact record per changed row to
+ChangeLog: (seq, table number, operation, row id). Consumers read the log in
+batches from their last acknowledged position and acknowledge what they have
+processed; the log is truncated up to the slowest consumer's position.
+A create_db.py rebuild replaces every row: it appends one reset record (row
+id 0) per captured table, which tells consumers to resync the table, and
+reinstalls the triggers once the new data is loaded
+
+    python src/cdc.py enable
+    python src/cdc.py register search-sync
+    python src/cdc.py read search-sync --limit 100 --ack
+    python src/cdc.py truncate
+"""
+
+import argparse
+
+from create_db import columns
+from db import DB_PATH, connect
+
+# operation codes stored in ChangeLog.op; RESET marks a table whose rows
+# were all replaced
+INSERT, UPDATE, DELETE, RESET = 1, 2, 3, 4
+OPERATIONS = {INSERT: "insert", UPDATE: "update", DELETE: "delete", RESET: "reset"}
+
+# trigger event and the row it reads the id from, per operation
+TRIGGER_EVENTS = {INSERT: ("INSERT", "new"), UPDATE: ("UPDATE", "new"), DELETE: ("DELETE", "old")}
+
+# records returned per read_changes() call unless a limit is given
+READ_BATCH = 1000
+
+
+def trigger_name(table, op):
+    return f"cdc_{table}_{OPERATIONS[op]}"
+
+
+def create_cdc_tables(conn):
+    # AUTOINCREMENT keeps seq from reusing values freed by truncation, which
+    # would hide new changes behind consumers' acknowledged positions
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS ChangeLog (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tbl INTEGER NOT NULL,
+        op INTEGER NOT NULL,
+        row_id INTEGER NOT NULL
+    )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS ChangeTable (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS ChangeConsumer (
+        name TEXT PRIMARY KEY,
+        position INTEGER NOT NULL
+    )"""
+    )
+
+
+def enable_cdc(conn, tables=None):
+    """Install change triggers on tables (default: every data table)"""
+    create_cdc_tables(conn)
+    for table in tables or columns:
+        conn.execute("INSERT OR IGNORE INTO ChangeTable (name) VALUES (?)", (table,))
+        (number,) = conn.execute("SELECT id FROM ChangeTable WHERE name = ?", (table,)).fetchone()
+        for op, (event, row) in TRIGGER_EVENTS.items():
+            conn.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS {trigger_name(table, op)} AFTER {event} ON {table} BEGIN
+    INSERT INTO ChangeLog (tbl, op, row_id) VALUES ({number}, {op}, {row}.id);
+END"""
+            )
+    conn.commit()
+
+
+def disable_cdc(conn, drop_log=False):
+    """Remove the change triggers, and with drop_log the log and consumers too"""
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'cdc\\_%' ESCAPE '\\'"
+    ).fetchall():
+        conn.execute(f"DROP TRIGGER {name}")
+    if drop_log:
+        for table in ("ChangeLog", "ChangeTable", "ChangeConsumer"):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.commit()
+
+
+def captured_tables(conn):
+    """Names of the tables that have change triggers installed"""
+    return [
+        name
+        for (name,) in conn.execute(
+            """SELECT DISTINCT tbl_name FROM sqlite_master
+            WHERE type = 'trigger' AND name LIKE 'cdc\\_%' ESCAPE '\\'
+            ORDER BY tbl_name"""
+        )
+    ]
+
+
+def mark_rebuild(conn, tables):
+    """Append a reset record for each of tables and return the first one's
+    seq; used when every row of the tables is replaced
+    """
+    create_cdc_tables(conn)
+    first = None
+    for table in tables:
+        conn.execute("INSERT OR IGNORE INTO ChangeTable (name) VALUES (?)", (table,))
+        cursor = conn.execute(
+            """INSERT INTO ChangeLog (tbl, op, row_id)
+            SELECT id, ?, 0 FROM ChangeTable WHERE name = ?""",
+            (RESET, table),
+        )
+        first = first or cursor.lastrowid
+    conn.commit()
+    return first
+
+
+def reset_tables(conn, since):
+    """Tables with a reset record at or after seq since"""
+    return [
+        name
+        for (name,) in conn.execute(
+            """SELECT DISTINCT t.name
+            FROM ChangeLog c
+            JOIN ChangeTable t ON t.id = c.tbl
+            WHERE c.seq >= ? AND c.op = ?
+            ORDER BY t.name""",
+            (since, RESET),
+        )
+    ]
+
+
+def register(conn, consumer, from_start=False):
+    """Add a consumer positioned at the end of the log, or before the oldest
+    retained record with from_start; returns its position
+    """
+    create_cdc_tables(conn)
+    if from_start:
+        (position,) = conn.execute("SELECT COALESCE(MIN(seq) - 1, 0) FROM ChangeLog").fetchone()
+    else:
+        (position,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ChangeLog").fetchone()
+    conn.execute(
+        "INSERT OR IGNORE INTO ChangeConsumer (name, position) VALUES (?, ?)",
+        (consumer, position),
+    )
+    conn.commit()
+    return conn.execute(
+        "SELECT position FROM ChangeConsumer WHERE name = ?", (consumer,)
+    ).fetchone()[0]
+
+
+def unregister(conn, consumer):
+    conn.execute("DELETE FROM ChangeConsumer WHERE name = ?", (consumer,))
+    conn.commit()
+
+
+def position(conn, consumer):
+    row = conn.execute("SELECT position FROM ChangeConsumer WHERE name = ?", (consumer,)).fetchone()
+    if row is None:
+        raise KeyError(f"unknown consumer '{consumer}'")
+    return row[0]
+
+
+def read_changes(conn, consumer, limit=READ_BATCH, after=None):
+    """The next limit records after the consumer's acknowledged position (or
+    after `after`, to page ahead before acknowledging) as (seq, table,
+    operation, row id) tuples, oldest first
+    """
+    start = position(conn, consumer) if after is None else after
+    return conn.execute(
+        """SELECT c.seq, t.name, c.op, c.row_id
+        FROM ChangeLog c
+        JOIN ChangeTable t ON t.id = c.tbl
+        WHERE c.seq > ?
+        ORDER BY c.seq
+        LIMIT ?""",
+        (start, limit),
+    ).fetchall()
+
+
+def ack(conn, consumer, seq):
+    """Mark every record up to seq as processed by consumer; positions only
+    move forward
+    """
+    position(conn, consumer)
+    conn.execute(
+        "UPDATE ChangeConsumer SET position = MAX(position, ?) WHERE name = ?", (seq, consumer)
+    )
+    conn.commit()
+
+
+def truncate(conn):
+    """Delete records every consumer has acknowledged and return how many;
+    nothing is deleted while no consumer is registered
+    """
+    cursor = conn.execute(
+        """DELETE FROM ChangeLog
+        WHERE seq <= (SELECT MIN(position) FROM ChangeConsumer)"""
+    )
+    conn.commit()
+    return cursor.rowcount
+
+
+def status(conn):
+    """(consumer, position, records behind) for every consumer, and the log's
+    (records, oldest seq, newest seq)
+    """
+    log = conn.execute("SELECT COUNT(*), MIN(seq), MAX(seq) FROM ChangeLog").fetchone()
+    consumers = conn.execute(
+        """SELECT name, position,
+               (SELECT COUNT(*) FROM ChangeLog WHERE seq > c.position)
+        FROM ChangeConsumer c
+        ORDER BY name"""
+    ).fetchall()
+    return consumers, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change data capture")
+    parser.add_argument("--db", default=DB_PATH, help="database to use")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enable_cmd = commands.add_parser("enable", help="install change triggers")
+    enable_cmd.add_argument("--table", action="append", choices=list(columns))
+    disable_cmd = commands.add_parser("disable", help="remove change triggers")
+    disable_cmd.add_argument("--drop-log", action="store_true", help="also drop the log")
+
+    register_cmd = commands.add_parser("register", help="add a consumer")
+    register_cmd.add_argument("consumer")
+    register_cmd.add_argument("--from-start", action="store_true", help="read retained history")
+    unregister_cmd = commands.add_parser("unregister", help="remove a consumer")
+    unregister_cmd.add_argument("consumer")
+
+    read_cmd = commands.add_parser("read", help="print the next batch for a consumer")
+    read_cmd.add_argument("consumer")
+    read_cmd.add_argument("--limit", type=int, default=READ_BATCH, help="records to read")
+    read_cmd.add_argument("--ack", action="store_true", help="acknowledge the batch")
+    ack_cmd = commands.add_parser("ack", help="acknowledge records up to a seq")
+    ack_cmd.add_argument("consumer")
+    ack_cmd.add_argument("seq", type=int)
+
+    commands.add_parser("truncate", help="drop records every consumer has acknowledged")
+    commands.add_parser("status", help="show consumer lag and log size")
+
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.command == "enable":
+            enable_cdc(conn, args.table)
+            print(f"Change capture enabled on {len(args.table or columns)} tables")
+        elif args.command == "disable":
+            disable_cdc(conn, args.drop_log)
+            print("Change capture disabled")
+        elif args.command == "register":
+            print(f"{args.consumer} starts after seq {register(conn, args.consumer, args.from_start)}")
+        elif args.command == "unregister":
+            unregister(conn, args.consumer)
+        elif args.command == "read":
+            changes = read_changes(conn, args.consumer, args.limit)
+            for seq, table, op, row_id in changes:
+                print(f"{seq:>10}  {OPERATIONS[op]:<7} {table:<26}{row_id}")
+            if changes and args.ack:
+                ack(conn, args.consumer, changes[-1][0])
+            print(f"\n{len(changes):,} changes{' acknowledged' if changes and args.ack else ''}")
+        elif args.command == "ack":
+            ack(conn, args.consumer, args.seq)
+        elif args.command == "truncate":
+            print(f"Removed {truncate(conn):,} records")
+        else:
+            consumers, (records, oldest, newest) = status(conn)
+            print(f"Log: {records:,} records (seq {oldest} - {newest})")
+            for name, acknowledged, behind in consumers:
+                print(f"  {name:<24} at {acknowledged:<10} {behind:>10,} behind")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
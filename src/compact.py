@@ -0,0 +1,257 @@
+"""
+Compact storage profile for the Real Estate Database
+Builds a copy of a standard database where dates are integer epoch days,
+enum-like text columns point at small lookup tables, tables are STRICT (and
+WITHOUT ROWID where a natural clustering key exists) and views named after
+the original tables present the original column shapes
+
+    python src/compact.py build
+    python src/compact.py compare
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+from benchmark import percentile, run_cold, run_warm
+from create_db import columns
+from db import DB_PATH, connect
+from queries import WORKLOAD
+
+COMPACT_PATH = "database/real_estate_compact.db"
+
+# julianday() of 1970-01-01, the zero of the epoch-day columns
+EPOCH_JULIAN_DAY = 2440587.5
+
+# (table, column) -> lookup table holding the distinct values
+ENUM_COLUMNS = {
+    ("Property", "type"): "PropertyType",
+    ("MarketData", "property_type"): "PropertyType",
+    ("MaintenanceRequest", "category"): "MaintenanceCategory",
+    ("MaintenanceRequest", "priority"): "MaintenancePriority",
+    ("MaintenanceRequest", "status"): "MaintenanceStatus",
+    ("Expense", "category"): "ExpenseCategory",
+    ("Utility", "utility_type"): "UtilityType",
+    ("PropertyDocument", "document_type"): "DocumentType",
+    ("Inspection", "inspection_type"): "InspectionType",
+    ("Inspection", "overall_rating"): "InspectionRating",
+    ("Insurance", "insurance_type"): "InsuranceType",
+}
+
+# tables stored WITHOUT ROWID, clustered on these primary keys; id stays last
+# so the key is unique even if a pair repeats
+CLUSTERED_TABLES = {
+    "PropertyAmenity": ("property_id", "amenity_id", "id"),
+    "FundPerformance": ("fund_id", "date", "id"),
+}
+
+# declared type in the standard schema -> STRICT storage type
+STORAGE_TYPES = {
+    "INTEGER": "INTEGER",
+    "REAL": "REAL",
+    "TEXT": "TEXT",
+    "DATE": "INTEGER",
+    "BOOLEAN": "INTEGER",
+}
+
+# queries written against the compact tables directly, next to the workload
+# query they replace
+NATIVE_QUERIES = [
+    (
+        "average_lease_term",
+        "SELECT AVG(end_date - start_date) AS average_lease_term FROM CompactLease",
+    ),
+    (
+        "maintenance_sla_by_priority",
+        """
+SELECT p.name, COUNT(*), AVG(mr.completed_date - mr.created_date),
+       MAX(mr.completed_date - mr.created_date)
+FROM CompactMaintenanceRequest mr
+JOIN MaintenancePriority p ON p.id = mr.priority
+WHERE mr.status = (SELECT id FROM MaintenanceStatus WHERE name = 'Completed')
+GROUP BY mr.priority
+""",
+    ),
+    (
+        "monthly_collections",
+        f"""
+SELECT strftime('%Y-%m', payment_date + {EPOCH_JULIAN_DAY}) AS month, COUNT(*), SUM(amount)
+FROM CompactPayment
+WHERE payment_date >= CAST(julianday('now', '-24 months') - {EPOCH_JULIAN_DAY} AS INTEGER)
+  AND payment_date <= CAST(julianday('now') - {EPOCH_JULIAN_DAY} AS INTEGER)
+GROUP BY month
+ORDER BY month
+""",
+    ),
+]
+
+
+def compact_name(table):
+    return f"Compact{table}"
+
+
+def build_compact(source=DB_PATH, dest=COMPACT_PATH):
+    """Write the compact profile of source to dest"""
+    if os.path.exists(dest):
+        os.remove(dest)
+    conn = connect(dest)
+    c = conn.cursor()
+    c.execute("ATTACH DATABASE ? AS src", (source,))
+
+    print("Creating lookup tables...")
+    lookups = {}
+    for (table, column), lookup in ENUM_COLUMNS.items():
+        lookups.setdefault(lookup, []).append((table, column))
+    for lookup, sources in lookups.items():
+        c.execute(
+            f"""CREATE TABLE {lookup} (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    ) STRICT"""
+        )
+        values = " UNION ".join(
+            f"SELECT DISTINCT {column} FROM src.{table} WHERE {column} IS NOT NULL"
+            for table, column in sources
+        )
+        c.execute(f"INSERT INTO {lookup} (name) {values} ORDER BY 1")
+
+    for table in columns:
+        print(f"Compacting {table}...")
+        info = c.execute(f"PRAGMA src.table_info({table})").fetchall()
+        definitions = []
+        selects = []
+        views = []
+        for _, name, declared, _, _, _ in info:
+            lookup = ENUM_COLUMNS.get((table, name))
+            if lookup:
+                definitions.append(f"{name} INTEGER REFERENCES {lookup}(id)")
+                selects.append(f"(SELECT id FROM {lookup} WHERE name = t.{name})")
+                views.append(f"(SELECT name FROM {lookup} WHERE id = t.{name}) AS {name}")
+            elif declared == "DATE":
+                definitions.append(f"{name} INTEGER")
+                selects.append(f"CAST(julianday(t.{name}) - {EPOCH_JULIAN_DAY} AS INTEGER)")
+                views.append(f"date(t.{name} + {EPOCH_JULIAN_DAY}) AS {name}")
+            else:
+                storage = STORAGE_TYPES.get(declared.upper(), "ANY")
+                if name == "id" and table not in CLUSTERED_TABLES:
+                    definitions.append("id INTEGER PRIMARY KEY")
+                else:
+                    definitions.append(f"{name} {storage}")
+                selects.append(f"t.{name}")
+                views.append(f"t.{name}")
+
+        options = "STRICT"
+        if table in CLUSTERED_TABLES:
+            definitions.append(f"PRIMARY KEY ({', '.join(CLUSTERED_TABLES[table])})")
+            options = "STRICT, WITHOUT ROWID"
+
+        names = ", ".join(row[1] for row in info)
+        column_sql = ",\n        ".join(definitions)
+        c.execute(
+            f"""CREATE TABLE {compact_name(table)} (
+        {column_sql}
+    ) {options}"""
+        )
+        c.execute(
+            f"INSERT INTO {compact_name(table)} ({names}) "
+            f"SELECT {', '.join(selects)} FROM src.{table} t"
+        )
+        c.execute(
+            f"CREATE VIEW {table} AS SELECT {', '.join(views)} FROM {compact_name(table)} t"
+        )
+        conn.commit()
+
+    c.execute("DETACH DATABASE src")
+    c.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+def used_bytes(path):
+    """Bytes of pages in use, ignoring free pages left behind by deletes"""
+    conn = connect(path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+    return page_size * (page_count - free_pages)
+
+
+def table_bytes(path, tables):
+    """Bytes used by tables and their indexes, from the dbstat virtual table"""
+    conn = connect(path)
+    try:
+        placeholders = ", ".join("?" for _ in tables)
+        (total,) = conn.execute(
+            f"""SELECT SUM(pgsize) FROM dbstat
+            WHERE name IN (
+                SELECT name FROM sqlite_master WHERE tbl_name IN ({placeholders})
+            )""",
+            list(tables),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+        return None
+    finally:
+        conn.close()
+    return total
+
+
+def compare(standard=DB_PATH, compact=COMPACT_PATH, runs=10):
+    """Print file size and workload latency for both layouts"""
+    standard_bytes = used_bytes(standard)
+    compact_bytes = used_bytes(compact)
+    print(f"Standard file: {standard_bytes:>14,} bytes")
+    print(
+        f"Compact file:  {compact_bytes:>14,} bytes "
+        f"({compact_bytes / standard_bytes:.0%} of standard)"
+    )
+
+    # the standard file also holds search and market indexes, so compare the
+    # base tables on their own as well
+    lookups = sorted(set(ENUM_COLUMNS.values()))
+    standard_tables = table_bytes(standard, list(columns))
+    compact_tables = table_bytes(compact, [compact_name(t) for t in columns] + lookups)
+    if standard_tables and compact_tables:
+        print(f"Standard base tables: {standard_tables:>14,} bytes")
+        print(
+            f"Compact base tables:  {compact_tables:>14,} bytes "
+            f"({compact_tables / standard_tables:.0%} of standard)"
+        )
+
+    native = dict(NATIVE_QUERIES)
+    print("\np50 latency in ms (warm / cold); native queries read the compact tables directly")
+    print(f"  {'query':<34}{'standard':>19}{'compact views':>19}{'compact native':>19}")
+    for name, sql in WORKLOAD:
+        cells = []
+        for path, query in [(standard, sql), (compact, sql), (compact, native.get(name))]:
+            if query is None:
+                cells.append(f"{'-':>19}")
+                continue
+            warm, _ = run_warm(path, query, runs)
+            cold, _ = run_cold(path, query, runs)
+            cells.append(f"{percentile(warm, 50):>11.1f} /{percentile(cold, 50):>6.1f}")
+        print(f"  {name:<34}{''.join(cells)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact storage profile")
+    parser.add_argument("command", choices=["build", "compare"])
+    parser.add_argument("--source", default=DB_PATH, help="standard database")
+    parser.add_argument("--dest", default=COMPACT_PATH, help="compact database")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        build_compact(args.source, args.dest)
+        print(f"Built {args.dest} in {time.perf_counter() - start:.2f}s")
+    else:
+        compare(args.source, args.dest, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,74 @@
-import sqlite3
+import argparse
+import calendar
+import os
 import random
-from datetime import datetime, timedelta
+import sqlite3
+import time
+from datetime import date, timedelta
+from itertools import islice
 import uuid
 from faker import Faker
 
+from alerts import drop_alert_tables, refresh_alerts
+from db import DB_PATH, connect, is_memory, is_uri, load_snapshot
+from ledger import create_ledger_index
+from market import create_market_index, drop_market_index
+from profiling import (
+    INDEX_CATEGORY,
+    TimedCalls,
+    add_time,
+    end_profile_phase,
+    new_profile,
+    print_summary,
+    start_profile_phase,
+    write_folded,
+)
+from search import create_search_indexes, drop_search_indexes
+
 fake = Faker()
 
-DB_PATH = "database/real_estate.db"
+# cached on-disk builds restored by golden_copy()
+GOLDEN_DIR = "database/golden"
+
+# version of the generated data and schema, stored in PRAGMA user_version by
+# a finished build and part of the golden file name; bump it whenever the
+# generators, the schema or the index phases change what a build produces
+GENERATOR_VERSION = 3
+
+# rows sent to the database per executemany call
+BATCH_SIZE = 5000
+
+# rows committed (with a BuildCheckpoint update) at a time, so an interrupted
+# build loses at most this much work per table
+CHECKPOINT_ROWS = 50_000
+
+# seconds between row-level progress lines
+PROGRESS_INTERVAL = 1.0
+
+# row counts at scale factor 1.0; the fixed-size lookups (funds, managers,
+# vendors, amenities) do not scale
+BASE_SIZES = {
+    "funds": 25,
+    "properties": 5000,
+    "tenants": 2000,
+    "managers": 15,
+    "vendors": 15,
+    "maintenance_requests": 8000,
+    "expenses": 15000,
+    "inspections": 6000,
+    "markets": 20,
+}
+SCALED_SIZES = [
+    "properties",
+    "tenants",
+    "maintenance_requests",
+    "expenses",
+    "inspections",
+    "markets",
+]
 
-conn = sqlite3.connect(DB_PATH)
-c = conn.cursor()
+# share of properties located in one of the MarketData markets
+MARKET_COVERAGE = 0.6
 
 # drop existing tables to start fresh
 tables_to_drop = [
@@ -35,273 +94,254 @@ tables_to_drop = [
     "Fund",
 ]
 
-print("Dropping existing tables...")
-for table in tables_to_drop:
-    c.execute(f"DROP TABLE IF EXISTS {table}")
-
-print("Creating new tables...")
-
 # schema
-c.execute(
+schema = [
     """CREATE TABLE IF NOT EXISTS Fund (
-    id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    inception_date DATE,
-    manager TEXT,
-    total_assets REAL
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        inception_date DATE,
+        manager TEXT,
+        total_assets REAL
+    )""",
     """CREATE TABLE IF NOT EXISTS Property (
-    id INTEGER PRIMARY KEY,
-    address TEXT NOT NULL,
-    city TEXT,
-    state TEXT,
-    zip TEXT,
-    type TEXT,
-    value REAL,
-    fund_id INTEGER,
-    FOREIGN KEY(fund_id) REFERENCES Fund(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        address TEXT NOT NULL,
+        city TEXT,
+        state TEXT,
+        zip TEXT,
+        type TEXT,
+        value REAL,
+        fund_id INTEGER,
+        FOREIGN KEY(fund_id) REFERENCES Fund(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Tenant (
-    id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    phone TEXT,
-    email TEXT
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        phone TEXT,
+        email TEXT
+    )""",
     """CREATE TABLE IF NOT EXISTS Lease (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    tenant_id INTEGER,
-    start_date DATE,
-    end_date DATE,
-    rent REAL,
-    deposit REAL,
-    FOREIGN KEY(property_id) REFERENCES Property(id),
-    FOREIGN KEY(tenant_id) REFERENCES Tenant(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        tenant_id INTEGER,
+        start_date DATE,
+        end_date DATE,
+        rent REAL,
+        deposit REAL,
+        FOREIGN KEY(property_id) REFERENCES Property(id),
+        FOREIGN KEY(tenant_id) REFERENCES Tenant(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Payment (
-    id INTEGER PRIMARY KEY,
-    lease_id INTEGER,
-    payment_date DATE,
-    amount REAL,
-    FOREIGN KEY(lease_id) REFERENCES Lease(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        lease_id INTEGER,
+        payment_date DATE,
+        amount REAL,
+        FOREIGN KEY(lease_id) REFERENCES Lease(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS FundPerformance (
-    id INTEGER PRIMARY KEY,
-    fund_id INTEGER,
-    date DATE,
-    nav REAL,
-    FOREIGN KEY(fund_id) REFERENCES Fund(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        fund_id INTEGER,
+        date DATE,
+        nav REAL,
+        FOREIGN KEY(fund_id) REFERENCES Fund(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS PropertyManager (
-    id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    email TEXT,
-    phone TEXT,
-    hire_date DATE,
-    salary REAL,
-    is_active BOOLEAN
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT,
+        phone TEXT,
+        hire_date DATE,
+        salary REAL,
+        is_active BOOLEAN
+    )""",
     """CREATE TABLE IF NOT EXISTS PropertyManagerAssignment (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    manager_id INTEGER,
-    start_date DATE,
-    end_date DATE,
-    FOREIGN KEY(property_id) REFERENCES Property(id),
-    FOREIGN KEY(manager_id) REFERENCES PropertyManager(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        manager_id INTEGER,
+        start_date DATE,
+        end_date DATE,
+        FOREIGN KEY(property_id) REFERENCES Property(id),
+        FOREIGN KEY(manager_id) REFERENCES PropertyManager(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Vendor (
-    id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    category TEXT,
-    contact_person TEXT,
-    phone TEXT,
-    email TEXT,
-    address TEXT,
-    rating REAL,
-    is_active BOOLEAN
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        category TEXT,
+        contact_person TEXT,
+        phone TEXT,
+        email TEXT,
+        address TEXT,
+        rating REAL,
+        is_active BOOLEAN
+    )""",
     """CREATE TABLE IF NOT EXISTS MaintenanceRequest (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    tenant_id INTEGER,
-    vendor_id INTEGER,
-    manager_id INTEGER,
-    category TEXT,
-    description TEXT,
-    priority TEXT,
-    status TEXT,
-    created_date DATE,
-    completed_date DATE,
-    estimated_cost REAL,
-    actual_cost REAL,
-    FOREIGN KEY(property_id) REFERENCES Property(id),
-    FOREIGN KEY(tenant_id) REFERENCES Tenant(id),
-    FOREIGN KEY(vendor_id) REFERENCES Vendor(id),
-    FOREIGN KEY(manager_id) REFERENCES PropertyManager(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        tenant_id INTEGER,
+        vendor_id INTEGER,
+        manager_id INTEGER,
+        category TEXT,
+        description TEXT,
+        priority TEXT,
+        status TEXT,
+        created_date DATE,
+        completed_date DATE,
+        estimated_cost REAL,
+        actual_cost REAL,
+        FOREIGN KEY(property_id) REFERENCES Property(id),
+        FOREIGN KEY(tenant_id) REFERENCES Tenant(id),
+        FOREIGN KEY(vendor_id) REFERENCES Vendor(id),
+        FOREIGN KEY(manager_id) REFERENCES PropertyManager(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Expense (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    vendor_id INTEGER,
-    category TEXT,
-    description TEXT,
-    amount REAL,
-    expense_date DATE,
-    invoice_number TEXT,
-    is_recurring BOOLEAN,
-    FOREIGN KEY(property_id) REFERENCES Property(id),
-    FOREIGN KEY(vendor_id) REFERENCES Vendor(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        vendor_id INTEGER,
+        category TEXT,
+        description TEXT,
+        amount REAL,
+        expense_date DATE,
+        invoice_number TEXT,
+        is_recurring BOOLEAN,
+        FOREIGN KEY(property_id) REFERENCES Property(id),
+        FOREIGN KEY(vendor_id) REFERENCES Vendor(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS PropertyDocument (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    document_type TEXT,
-    document_name TEXT,
-    file_path TEXT,
-    upload_date DATE,
-    expiry_date DATE,
-    FOREIGN KEY(property_id) REFERENCES Property(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        document_type TEXT,
+        document_name TEXT,
+        file_path TEXT,
+        upload_date DATE,
+        expiry_date DATE,
+        FOREIGN KEY(property_id) REFERENCES Property(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Inspection (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    inspector_name TEXT,
-    inspection_type TEXT,
-    inspection_date DATE,
-    overall_rating TEXT,
-    notes TEXT,
-    next_inspection_date DATE,
-    FOREIGN KEY(property_id) REFERENCES Property(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        inspector_name TEXT,
+        inspection_type TEXT,
+        inspection_date DATE,
+        overall_rating TEXT,
+        notes TEXT,
+        next_inspection_date DATE,
+        FOREIGN KEY(property_id) REFERENCES Property(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Utility (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    utility_type TEXT,
-    provider TEXT,
-    account_number TEXT,
-    monthly_average REAL,
-    is_tenant_responsibility BOOLEAN,
-    FOREIGN KEY(property_id) REFERENCES Property(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        utility_type TEXT,
+        provider TEXT,
+        account_number TEXT,
+        monthly_average REAL,
+        is_tenant_responsibility BOOLEAN,
+        FOREIGN KEY(property_id) REFERENCES Property(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS TenantHistory (
-    id INTEGER PRIMARY KEY,
-    tenant_id INTEGER,
-    previous_address TEXT,
-    employment_status TEXT,
-    annual_income REAL,
-    credit_score INTEGER,
-    reference_contacts TEXT,
-    background_check_date DATE,
-    FOREIGN KEY(tenant_id) REFERENCES Tenant(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        tenant_id INTEGER,
+        previous_address TEXT,
+        employment_status TEXT,
+        annual_income REAL,
+        credit_score INTEGER,
+        reference_contacts TEXT,
+        background_check_date DATE,
+        FOREIGN KEY(tenant_id) REFERENCES Tenant(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS MarketData (
-    id INTEGER PRIMARY KEY,
-    city TEXT,
-    state TEXT,
-    property_type TEXT,
-    date DATE,
-    avg_price_per_sqft REAL,
-    vacancy_rate REAL,
-    rental_yield REAL,
-    appreciation_rate REAL
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        city TEXT,
+        state TEXT,
+        property_type TEXT,
+        date DATE,
+        avg_price_per_sqft REAL,
+        vacancy_rate REAL,
+        rental_yield REAL,
+        appreciation_rate REAL
+    )""",
     """CREATE TABLE IF NOT EXISTS Amenity (
-    id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    category TEXT,
-    description TEXT
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        category TEXT,
+        description TEXT
+    )""",
     """CREATE TABLE IF NOT EXISTS PropertyAmenity (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    amenity_id INTEGER,
-    is_available BOOLEAN,
-    additional_cost REAL,
-    FOREIGN KEY(property_id) REFERENCES Property(id),
-    FOREIGN KEY(amenity_id) REFERENCES Amenity(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        amenity_id INTEGER,
+        is_available BOOLEAN,
+        additional_cost REAL,
+        FOREIGN KEY(property_id) REFERENCES Property(id),
+        FOREIGN KEY(amenity_id) REFERENCES Amenity(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS LeaseRenewal (
-    id INTEGER PRIMARY KEY,
-    lease_id INTEGER,
-    renewal_date DATE,
-    new_rent REAL,
-    new_end_date DATE,
-    renewal_terms TEXT,
-    FOREIGN KEY(lease_id) REFERENCES Lease(id)
-)"""
-)
-
-c.execute(
+        id INTEGER PRIMARY KEY,
+        lease_id INTEGER,
+        renewal_date DATE,
+        new_rent REAL,
+        new_end_date DATE,
+        renewal_terms TEXT,
+        FOREIGN KEY(lease_id) REFERENCES Lease(id)
+    )""",
     """CREATE TABLE IF NOT EXISTS Insurance (
-    id INTEGER PRIMARY KEY,
-    property_id INTEGER,
-    insurance_type TEXT,
-    provider TEXT,
-    policy_number TEXT,
-    start_date DATE,
-    end_date DATE,
-    premium_amount REAL,
-    coverage_amount REAL,
-    FOREIGN KEY(property_id) REFERENCES Property(id)
-)"""
-)
+        id INTEGER PRIMARY KEY,
+        property_id INTEGER,
+        insurance_type TEXT,
+        provider TEXT,
+        policy_number TEXT,
+        start_date DATE,
+        end_date DATE,
+        premium_amount REAL,
+        coverage_amount REAL,
+        FOREIGN KEY(property_id) REFERENCES Property(id)
+    )""",
+]
+
 
-conn.commit()
+def _parse_columns(ddl):
+    """Return (table, ((name, declared type, not null), ...)) for one CREATE
+    TABLE statement
+    """
+    table = ddl.split("EXISTS ", 1)[1].split(" (", 1)[0]
+    definitions = [
+        (line.split()[0], line.split()[1].rstrip(","), "NOT NULL" in line)
+        for line in ddl.splitlines()[1:-1]
+        if not line.strip().startswith("FOREIGN")
+    ]
+    return table, tuple(definitions)
+
+
+# declared columns of each table, in insert order
+column_definitions = dict(_parse_columns(ddl) for ddl in schema)
+
+# insert column order for each table, matching the row generators below
+columns = {
+    table: tuple(name for name, _, _ in definitions)
+    for table, definitions in column_definitions.items()
+}
+
+# one row per finished (or partly loaded) build phase; every row carries the
+# scale and seed the build was started with so --resume can pick them up
+checkpoint_schema = """CREATE TABLE IF NOT EXISTS BuildCheckpoint (
+        phase TEXT PRIMARY KEY,
+        scale REAL NOT NULL,
+        seed INTEGER NOT NULL,
+        rows INTEGER NOT NULL,
+        completed BOOLEAN NOT NULL,
+        updated_at TEXT NOT NULL
+    )"""
+
+# BuildCheckpoint phase of a rebuild under change capture; rows holds the
+# seq of its first reset record
+CAPTURE_PHASE = "change_capture"
+
+# phases after the table loads: (checkpoint name, label, builder)
+INDEX_PHASES = [
+    ("search_indexes", "search indexes", create_search_indexes),
+    ("market_index", "market lookup index", create_market_index),
+    ("alert_index", "alert index", lambda conn: refresh_alerts(conn, full=True)),
+    ("ledger_index", "tenant ledger index", create_ledger_index),
+]
 
 # sample data generation using Faker
 property_types = [
@@ -380,92 +420,22 @@ amenity_categories = [
     "Convenience",
 ]
 
-# funds - increased from 10 to 25
-for i in range(1, 26):
-    name = fake.company() + " Real Estate Fund"
-    inception = fake.date_between(start_date="-15y", end_date="-1y")
-    manager = fake.name()
-    assets = round(random.uniform(50_000_000, 2_000_000_000), 2)  # Increased range
-    c.execute(
-        "INSERT INTO Fund (id, name, inception_date, manager, total_assets) VALUES (?, ?, ?, ?, ?)",
-        (i, name, inception, manager, assets),
-    )
-
-# properties - increased from 1000 to 5000
-for i in range(1, 5001):
-    address = fake.street_address()
-    city = fake.city()
-    state = fake.state_abbr()
-    zip_code = fake.zipcode()
-    ptype = random.choice(property_types)
-    value = round(random.uniform(100_000, 50_000_000), 2)  # Increased range
-    fund_id = random.randint(1, 25)  # 25 funds
-    c.execute(
-        "INSERT INTO Property (id, address, city, state, zip, type, value, fund_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        (i, address, city, state, zip_code, ptype, value, fund_id),
-    )
-
-# tenants - increased from 500 to 2000
-for i in range(1, 2001):
-    name = fake.name()
-    phone = fake.phone_number()
-    email = fake.email()
-    c.execute(
-        "INSERT INTO Tenant (id, name, phone, email) VALUES (?, ?, ?, ?)",
-        (i, name, phone, email),
-    )
-
-# property managers
-for i in range(1, 16):  # 15 property managers
-    name = fake.name()
-    hire_date = fake.date_between(start_date="-8y", end_date="-1y")
-    salary = round(random.uniform(45_000, 120_000), 2)
-    email = fake.email()
-    phone = fake.phone_number()
-    is_active = random.choice([True, True, True, False])  # 75% active
-    c.execute(
-        "INSERT INTO PropertyManager (id, name, email, phone, hire_date, salary, is_active) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (i, name, email, phone, hire_date, salary, is_active),
-    )
-
-# property manager assignments
-assignment_id = 1
-for property_id in range(1, 5001):
-    manager_id = random.randint(1, 15)  # 15 property managers
-    start_date = fake.date_between(start_date="-5y", end_date="-1m")
-    end_date = None
-    if random.random() < 0.2:  # 20% have ended assignments
-        end_date = fake.date_between(start_date=start_date, end_date="today")
-
-    c.execute(
-        "INSERT INTO PropertyManagerAssignment (id, property_id, manager_id, start_date, end_date) VALUES (?, ?, ?, ?, ?)",
-        (
-            assignment_id,
-            property_id,
-            manager_id,
-            start_date,
-            end_date,
-        ),
-    )
-    assignment_id += 1
-
-# vendors
-for i in range(1, 16):  # 15 vendors
-    name = fake.company()
-    category = random.choice(vendor_categories)
-    contact_person = fake.name()
-    phone = fake.phone_number()
-    email = fake.company_email()
-    address = fake.address()
-    rating = round(random.uniform(2.5, 5.0), 1)
-    is_active = random.choice([True, True, True, False])  # 75% active
-
-    c.execute(
-        "INSERT INTO Vendor (id, name, category, contact_person, phone, email, address, rating, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (i, name, category, contact_person, phone, email, address, rating, is_active),
-    )
-
-# amenities
+utility_providers = {
+    "Electricity": ["PowerCorp", "ElectricCo", "Energy Plus"],
+    "Gas": ["GasCorp", "Natural Gas Co", "Gas Solutions"],
+    "Water": ["City Water", "Water Works", "Aqua Services"],
+    "Sewer": ["City Sewer", "Waste Management", "Sewer Services"],
+    "Internet": ["FastNet", "WebCorp", "ConnectCo"],
+    "Cable": ["CableCorp", "TV Plus", "MediaCo"],
+    "Trash": ["Waste Corp", "Clean Services", "Garbage Co"],
+}
+insurance_types = ["Property", "Liability", "Flood", "Earthquake", "Umbrella"]
+renewal_terms_options = [
+    "Standard renewal",
+    "Early renewal discount",
+    "Rent increase applied",
+    "Extended term",
+]
 amenities_data = [
     ("Swimming Pool", "Recreation", "Outdoor swimming pool with deck area"),
     ("Fitness Center", "Fitness", "Fully equipped gym with modern equipment"),
@@ -479,97 +449,194 @@ amenities_data = [
     ("Storage Units", "Convenience", "Additional storage space"),
 ]
 
-for i, (name, category, description) in enumerate(amenities_data, 1):
-    c.execute(
-        "INSERT INTO Amenity (id, name, category, description) VALUES (?, ?, ?, ?)",
-        (i, name, category, description),
-    )
 
-print("Creating leases and related data...")
-
-# leases - more comprehensive lease generation
-lease_id = 1
-for property_id in range(1, 5001):
-    num_leases = random.randint(1, 4)  # Increased potential leases per property
-    for _ in range(num_leases):
-        tenant_id = random.randint(1, 2000)  # Updated range for increased tenants
-        start = fake.date_between(start_date="-5y", end_date="today")
-        end = fake.date_between(start_date=start, end_date="+2y")
-        rent = round(random.uniform(1000, 25000), 2)  # Increased range
-        deposit = round(rent * random.uniform(0.5, 2), 2)
-        c.execute(
-            "INSERT INTO Lease (id, property_id, tenant_id, start_date, end_date, rent, deposit) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (lease_id, property_id, tenant_id, start, end, rent, deposit),
-        )
-        lease_id += 1
-
-# payments
-print("Creating payments data...")
-payment_id = 1
-for lease in c.execute("SELECT id, start_date, end_date, rent FROM Lease"):
-    lease_id, start_date, end_date, rent = lease
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    
-    # Calculate number of months in the lease
-    current_date = start
-    while current_date <= end:
-        # Add some variability - some late payments, some early
-        pay_date = current_date
-        if random.random() < 0.05:  # 5% late payments
-            pay_date = current_date + timedelta(days=random.randint(1, 15))
-        
-        amount = rent
-        # Sometimes partial payments
-        if random.random() < 0.02:  # 2% partial payments
-            amount = round(rent * random.uniform(0.3, 0.9), 2)
-        
-        c.execute(
-            "INSERT INTO Payment (id, lease_id, payment_date, amount) VALUES (?, ?, ?, ?)",
-            (payment_id, lease_id, pay_date, amount),
-        )
-        payment_id += 1
-        
-        # Move to next month
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1)
+def scaled_sizes(scale=1.0):
+    """Return the row counts for a scale factor (1.0 is the default build)"""
+    sizes = dict(BASE_SIZES)
+    for key in SCALED_SIZES:
+        sizes[key] = max(1, int(BASE_SIZES[key] * scale))
+    return sizes
+
+
+def expected_rows(sizes):
+    """Approximate rows per table, used for progress and ETA only"""
+    leases = sizes["properties"] * 2.5
+    return {
+        "Fund": sizes["funds"],
+        "Property": sizes["properties"],
+        "Tenant": sizes["tenants"],
+        "PropertyManager": sizes["managers"],
+        "PropertyManagerAssignment": sizes["properties"],
+        "Vendor": sizes["vendors"],
+        "Amenity": len(amenities_data),
+        "Lease": leases,
+        "Payment": leases * 27.5,
+        "MaintenanceRequest": sizes["maintenance_requests"],
+        "Expense": sizes["expenses"],
+        "PropertyDocument": sizes["properties"] * 5,
+        "Inspection": sizes["inspections"],
+        "Utility": sizes["properties"] * 5,
+        "TenantHistory": sizes["tenants"] * 0.8,
+        "MarketData": sizes["markets"] * len(property_types) * 20,
+        "PropertyAmenity": sizes["properties"] * 5,
+        "FundPerformance": sizes["funds"] * 313,
+        "LeaseRenewal": leases * 0.3,
+        "Insurance": sizes["properties"] * 2,
+    }
+
+
+def seed(value):
+    """Seed both random and Faker so a build is reproducible"""
+    random.seed(value)
+    Faker.seed(value)
+
+
+# row generators - one per table, each yielding tuples in `columns` order
+
+
+def fund_rows(sizes):
+    for i in range(1, sizes["funds"] + 1):
+        name = fake.company() + " Real Estate Fund"
+        inception = fake.date_between(start_date="-15y", end_date="-1y")
+        manager = fake.name()
+        assets = round(random.uniform(50_000_000, 2_000_000_000), 2)
+        yield (i, name, inception, manager, assets)
+
+
+def market_locations(sizes):
+    """Pick the (city, state) pairs that MarketData covers"""
+    return [(fake.city(), fake.state_abbr()) for _ in range(sizes["markets"])]
+
+
+def property_rows(sizes, markets):
+    for i in range(1, sizes["properties"] + 1):
+        address = fake.street_address()
+        if random.random() < MARKET_COVERAGE:
+            city, state = random.choice(markets)
         else:
-            current_date = current_date.replace(month=current_date.month + 1)
-
-# maintenance requests
-print("Creating maintenance requests...")
-request_id = 1
-for _ in range(8000):  # Generate 8000 maintenance requests
-    property_id = random.randint(1, 5000)
-    tenant_id = (
-        random.randint(1, 2000) if random.random() < 0.7 else None
-    )  # 70% from tenants
-    vendor_id = (
-        random.randint(1, 15) if random.random() < 0.6 else None
-    )  # 60% assigned vendor
-    manager_id = random.randint(1, 15)  # 15 property managers
-    category = random.choice(maintenance_categories)
-    priority = random.choice(maintenance_priorities)
-    status = random.choice(maintenance_statuses)
-
-    created_date = fake.date_between(start_date="-5y", end_date="today")
-    completed_date = None
-    if status == "Completed":
-        completed_date = fake.date_between(start_date=created_date, end_date="today")
-
-    estimated_cost = round(random.uniform(50, 5000), 2)
-    actual_cost = None
-    if status == "Completed":
-        actual_cost = round(estimated_cost * random.uniform(0.8, 1.3), 2)
-
-    description = fake.sentence(nb_words=6)
-
-    c.execute(
-        """INSERT INTO MaintenanceRequest 
-                 (id, property_id, tenant_id, vendor_id, manager_id, category, description, priority, status, 
-                  created_date, completed_date, estimated_cost, actual_cost) 
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
+            city = fake.city()
+            state = fake.state_abbr()
+        zip_code = fake.zipcode()
+        ptype = random.choice(property_types)
+        value = round(random.uniform(100_000, 50_000_000), 2)
+        fund_id = random.randint(1, sizes["funds"])
+        yield (i, address, city, state, zip_code, ptype, value, fund_id)
+
+
+def tenant_rows(sizes):
+    for i in range(1, sizes["tenants"] + 1):
+        yield (i, fake.name(), fake.phone_number(), fake.email())
+
+
+def property_manager_rows(sizes):
+    for i in range(1, sizes["managers"] + 1):
+        name = fake.name()
+        hire_date = fake.date_between(start_date="-8y", end_date="-1y")
+        salary = round(random.uniform(45_000, 120_000), 2)
+        email = fake.email()
+        phone = fake.phone_number()
+        is_active = random.choice([True, True, True, False])  # 75% active
+        yield (i, name, email, phone, hire_date, salary, is_active)
+
+
+def property_manager_assignment_rows(sizes):
+    for property_id in range(1, sizes["properties"] + 1):
+        manager_id = random.randint(1, sizes["managers"])
+        start_date = fake.date_between(start_date="-5y", end_date="-1m")
+        end_date = None
+        if random.random() < 0.2:  # 20% have ended assignments
+            end_date = fake.date_between(start_date=start_date, end_date="today")
+        yield (property_id, property_id, manager_id, start_date, end_date)
+
+
+def vendor_rows(sizes):
+    for i in range(1, sizes["vendors"] + 1):
+        name = fake.company()
+        category = random.choice(vendor_categories)
+        contact_person = fake.name()
+        phone = fake.phone_number()
+        email = fake.company_email()
+        address = fake.address()
+        rating = round(random.uniform(2.5, 5.0), 1)
+        is_active = random.choice([True, True, True, False])  # 75% active
+        yield (i, name, category, contact_person, phone, email, address, rating, is_active)
+
+
+def amenity_rows(sizes):
+    for i, (name, category, description) in enumerate(amenities_data, 1):
+        yield (i, name, category, description)
+
+
+def lease_rows(sizes):
+    lease_id = 1
+    for property_id in range(1, sizes["properties"] + 1):
+        for _ in range(random.randint(1, 4)):
+            tenant_id = random.randint(1, sizes["tenants"])
+            start = fake.date_between(start_date="-5y", end_date="today")
+            end = fake.date_between(start_date=start, end_date="+2y")
+            rent = round(random.uniform(1000, 25000), 2)
+            deposit = round(rent * random.uniform(0.5, 2), 2)
+            yield (lease_id, property_id, tenant_id, start, end, rent, deposit)
+            lease_id += 1
+
+
+def payment_rows(leases):
+    payment_id = 1
+    for lease_id, _, _, start, end, rent, _ in leases:
+        # one payment per month of the lease, on the start day (clamped to the
+        # length of short months)
+        month = 0
+        current_date = start
+        while current_date <= end:
+            # add some variability - some late payments, some early
+            pay_date = current_date
+            if random.random() < 0.05:  # 5% late payments
+                pay_date = current_date + timedelta(days=random.randint(1, 15))
+
+            amount = rent
+            # sometimes partial payments
+            if random.random() < 0.02:  # 2% partial payments
+                amount = round(rent * random.uniform(0.3, 0.9), 2)
+
+            yield (payment_id, lease_id, pay_date, amount)
+            payment_id += 1
+
+            # move to next month
+            month += 1
+            year, month_index = divmod(start.month - 1 + month, 12)
+            year += start.year
+            day = min(start.day, calendar.monthrange(year, month_index + 1)[1])
+            current_date = date(year, month_index + 1, day)
+
+
+def maintenance_request_rows(sizes, start_id=1, count=None):
+    count = sizes["maintenance_requests"] if count is None else count
+    for request_id in range(start_id, start_id + count):
+        property_id = random.randint(1, sizes["properties"])
+        tenant_id = (
+            random.randint(1, sizes["tenants"]) if random.random() < 0.7 else None
+        )  # 70% from tenants
+        vendor_id = (
+            random.randint(1, sizes["vendors"]) if random.random() < 0.6 else None
+        )  # 60% assigned vendor
+        manager_id = random.randint(1, sizes["managers"])
+        category = random.choice(maintenance_categories)
+        priority = random.choice(maintenance_priorities)
+        status = random.choice(maintenance_statuses)
+
+        created_date = fake.date_between(start_date="-5y", end_date="today")
+        completed_date = None
+        if status == "Completed":
+            completed_date = fake.date_between(start_date=created_date, end_date="today")
+
+        estimated_cost = round(random.uniform(50, 5000), 2)
+        actual_cost = None
+        if status == "Completed":
+            actual_cost = round(estimated_cost * random.uniform(0.8, 1.3), 2)
+
+        description = fake.sentence(nb_words=6)
+
+        yield (
             request_id,
             property_id,
             tenant_id,
@@ -583,29 +650,20 @@ for _ in range(8000):  # Generate 8000 maintenance requests
             completed_date,
             estimated_cost,
             actual_cost,
-        ),
-    )
-    request_id += 1
-
-# expenses
-print("Creating expenses...")
-expense_id = 1
-for _ in range(15000):  # Generate 15000 expenses
-    property_id = random.randint(1, 5000)
-    vendor_id = random.randint(1, 15) if random.random() < 0.8 else None
-    category = random.choice(expense_categories)
-    amount = round(random.uniform(25, 10000), 2)
-    expense_date = fake.date_between(start_date="-5y", end_date="today")
-    invoice_number = fake.bothify(text="INV-######")
-    is_recurring = random.choice([True, False])
-
-    description = fake.sentence(nb_words=4)
+        )
 
-    c.execute(
-        """INSERT INTO Expense 
-                 (id, property_id, vendor_id, category, description, amount, expense_date, invoice_number, is_recurring) 
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
+
+def expense_rows(sizes):
+    for expense_id in range(1, sizes["expenses"] + 1):
+        property_id = random.randint(1, sizes["properties"])
+        vendor_id = random.randint(1, sizes["vendors"]) if random.random() < 0.8 else None
+        category = random.choice(expense_categories)
+        amount = round(random.uniform(25, 10000), 2)
+        expense_date = fake.date_between(start_date="-5y", end_date="today")
+        invoice_number = fake.bothify(text="INV-######")
+        is_recurring = random.choice([True, False])
+        description = fake.sentence(nb_words=4)
+        yield (
             expense_id,
             property_id,
             vendor_id,
@@ -615,29 +673,21 @@ for _ in range(15000):  # Generate 15000 expenses
             expense_date,
             invoice_number,
             is_recurring,
-        ),
-    )
-    expense_id += 1
-
-# property documents
-print("Creating property documents...")
-doc_id = 1
-for property_id in range(1, 5001):
-    num_docs = random.randint(2, 8)  # 2-8 documents per property
-    for _ in range(num_docs):
-        doc_type = random.choice(document_types)
-        doc_name = f"{doc_type.replace(' ', '_')}_{property_id}_{fake.random_int(min=1000, max=9999)}.pdf"
-        file_path = f"/documents/property_{property_id}/{doc_name}"
-        upload_date = fake.date_between(start_date="-5y", end_date="today")
-        expiry_date = None
-        if doc_type in ["Insurance Policy", "Permit", "Lease Agreement"]:
-            expiry_date = fake.date_between(start_date=upload_date, end_date="+3y")
-
-        c.execute(
-            """INSERT INTO PropertyDocument 
-                     (id, property_id, document_type, document_name, file_path, upload_date, expiry_date) 
-                     VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
+        )
+
+
+def property_document_rows(sizes):
+    doc_id = 1
+    for property_id in range(1, sizes["properties"] + 1):
+        for _ in range(random.randint(2, 8)):  # 2-8 documents per property
+            doc_type = random.choice(document_types)
+            doc_name = f"{doc_type.replace(' ', '_')}_{property_id}_{fake.random_int(min=1000, max=9999)}.pdf"
+            file_path = f"/documents/property_{property_id}/{doc_name}"
+            upload_date = fake.date_between(start_date="-5y", end_date="today")
+            expiry_date = None
+            if doc_type in ["Insurance Policy", "Permit", "Lease Agreement"]:
+                expiry_date = fake.date_between(start_date=upload_date, end_date="+3y")
+            yield (
                 doc_id,
                 property_id,
                 doc_type,
@@ -645,27 +695,20 @@ for property_id in range(1, 5001):
                 file_path,
                 upload_date,
                 expiry_date,
-            ),
-        )
-        doc_id += 1
-
-# inspections
-print("Creating inspections...")
-inspection_id = 1
-for _ in range(6000):  # Generate 6000 inspections
-    property_id = random.randint(1, 5000)
-    inspector_name = fake.name()
-    inspection_type = random.choice(inspection_types)
-    inspection_date = fake.date_between(start_date="-5y", end_date="today")
-    overall_rating = random.choice(inspection_ratings)
-    notes = fake.text(max_nb_chars=200)
-    next_inspection_date = fake.date_between(start_date=inspection_date, end_date="+1y")
-
-    c.execute(
-        """INSERT INTO Inspection 
-                 (id, property_id, inspector_name, inspection_type, inspection_date, overall_rating, notes, next_inspection_date) 
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
+            )
+            doc_id += 1
+
+
+def inspection_rows(sizes):
+    for inspection_id in range(1, sizes["inspections"] + 1):
+        property_id = random.randint(1, sizes["properties"])
+        inspector_name = fake.name()
+        inspection_type = random.choice(inspection_types)
+        inspection_date = fake.date_between(start_date="-5y", end_date="today")
+        overall_rating = random.choice(inspection_ratings)
+        notes = fake.text(max_nb_chars=200)
+        next_inspection_date = fake.date_between(start_date=inspection_date, end_date="+1y")
+        yield (
             inspection_id,
             property_id,
             inspector_name,
@@ -674,36 +717,19 @@ for _ in range(6000):  # Generate 6000 inspections
             overall_rating,
             notes,
             next_inspection_date,
-        ),
-    )
-    inspection_id += 1
-
-# utilities
-print("Creating utilities...")
-utility_id = 1
-for property_id in range(1, 5001):
-    num_utilities = random.randint(3, 7)  # 3-7 utilities per property
-    selected_utilities = random.sample(utility_types, num_utilities)
-    for utility_type in selected_utilities:
-        provider_names = {
-            "Electricity": ["PowerCorp", "ElectricCo", "Energy Plus"],
-            "Gas": ["GasCorp", "Natural Gas Co", "Gas Solutions"],
-            "Water": ["City Water", "Water Works", "Aqua Services"],
-            "Sewer": ["City Sewer", "Waste Management", "Sewer Services"],
-            "Internet": ["FastNet", "WebCorp", "ConnectCo"],
-            "Cable": ["CableCorp", "TV Plus", "MediaCo"],
-            "Trash": ["Waste Corp", "Clean Services", "Garbage Co"],
-        }
-        provider = random.choice(provider_names.get(utility_type, ["Generic Provider"]))
-        account_number = f"{utility_type[:3].upper()}-{random.randint(100000, 999999)}"
-        monthly_average = round(random.uniform(25, 500), 2)
-        is_tenant_responsibility = random.choice([True, False])
-
-        c.execute(
-            """INSERT INTO Utility 
-                     (id, property_id, utility_type, provider, account_number, monthly_average, is_tenant_responsibility) 
-                     VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
+        )
+
+
+def utility_rows(sizes):
+    utility_id = 1
+    for property_id in range(1, sizes["properties"] + 1):
+        num_utilities = random.randint(3, 7)  # 3-7 utilities per property
+        for utility_type in random.sample(utility_types, num_utilities):
+            provider = random.choice(utility_providers.get(utility_type, ["Generic Provider"]))
+            account_number = f"{utility_type[:3].upper()}-{random.randint(100000, 999999)}"
+            monthly_average = round(random.uniform(25, 500), 2)
+            is_tenant_responsibility = random.choice([True, False])
+            yield (
                 utility_id,
                 property_id,
                 utility_type,
@@ -711,26 +737,22 @@ for property_id in range(1, 5001):
                 account_number,
                 monthly_average,
                 is_tenant_responsibility,
-            ),
-        )
-        utility_id += 1
-
-# tenant history
-print("Creating tenant history...")
-for tenant_id in range(1, 2001):
-    if random.random() < 0.8:  # 80% of tenants have history
-        previous_address = fake.address()
-        employment_status = random.choice(employment_statuses)
-        annual_income = round(random.uniform(25000, 150000), 2)
-        credit_score = random.randint(300, 850)
-        references = f"{fake.name()}, {fake.name()}"
-        background_check_date = fake.date_between(start_date="-5y", end_date="today")
-
-        c.execute(
-            """INSERT INTO TenantHistory 
-                     (tenant_id, previous_address, employment_status, annual_income, credit_score, reference_contacts, background_check_date) 
-                     VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
+            )
+            utility_id += 1
+
+
+def tenant_history_rows(sizes):
+    history_id = 1
+    for tenant_id in range(1, sizes["tenants"] + 1):
+        if random.random() < 0.8:  # 80% of tenants have history
+            previous_address = fake.address()
+            employment_status = random.choice(employment_statuses)
+            annual_income = round(random.uniform(25000, 150000), 2)
+            credit_score = random.randint(300, 850)
+            references = f"{fake.name()}, {fake.name()}"
+            background_check_date = fake.date_between(start_date="-5y", end_date="today")
+            yield (
+                history_id,
                 tenant_id,
                 previous_address,
                 employment_status,
@@ -738,133 +760,87 @@ for tenant_id in range(1, 2001):
                 credit_score,
                 references,
                 background_check_date,
-            ),
-        )
-
-# market data
-print("Creating market data...")
-market_id = 1
-cities_sample = [fake.city() for _ in range(20)]  # Generate 20 cities
-for city in cities_sample:
-    state = fake.state_abbr()
-    for prop_type in property_types:
-        for month in range(0, 60, 3):  # 5 years, quarterly data
-            date = fake.date_between(start_date="-5y", end_date="today")
-            avg_price_per_sqft = round(random.uniform(50, 800), 2)
-            vacancy_rate = round(random.uniform(0.02, 0.15), 3)
-            rental_yield = round(random.uniform(0.03, 0.12), 3)
-            appreciation_rate = round(random.uniform(-0.05, 0.15), 3)
-
-            c.execute(
-                """INSERT INTO MarketData 
-                         (id, city, state, property_type, date, avg_price_per_sqft, vacancy_rate, rental_yield, appreciation_rate) 
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
+            )
+            history_id += 1
+
+
+def market_data_rows(markets):
+    market_id = 1
+    for city, state in markets:
+        for prop_type in property_types:
+            for _ in range(0, 60, 3):  # 5 years, quarterly data
+                market_date = fake.date_between(start_date="-5y", end_date="today")
+                avg_price_per_sqft = round(random.uniform(50, 800), 2)
+                vacancy_rate = round(random.uniform(0.02, 0.15), 3)
+                rental_yield = round(random.uniform(0.03, 0.12), 3)
+                appreciation_rate = round(random.uniform(-0.05, 0.15), 3)
+                yield (
                     market_id,
                     city,
                     state,
                     prop_type,
-                    date,
+                    market_date,
                     avg_price_per_sqft,
                     vacancy_rate,
                     rental_yield,
                     appreciation_rate,
-                ),
-            )
-            market_id += 1
-
-# property amenities
-print("Creating property amenities...")
-amenity_id = 1
-for property_id in range(1, 5001):
-    num_amenities = random.randint(2, 8)  # 2-8 amenities per property
-    selected_amenities = random.sample(range(1, 11), num_amenities)  # Amenity IDs 1-10
-    for amenity_db_id in selected_amenities:
-        is_available = random.choice([True, True, True, False])  # 75% available
-        additional_cost = 0
-        if random.random() < 0.3:  # 30% have additional cost
-            additional_cost = round(random.uniform(10, 200), 2)
-
-        c.execute(
-            """INSERT INTO PropertyAmenity 
-                     (id, property_id, amenity_id, is_available, additional_cost) 
-                     VALUES (?, ?, ?, ?, ?)""",
-            (amenity_id, property_id, amenity_db_id, is_available, additional_cost),
-        )
-        amenity_id += 1
-
-# fund performance - expanded
-print("Creating fund performance data...")
-performance_id = 1
-for fund_id in range(1, 26):  # 25 funds
-    for d in range(0, 2190, 7):  # 6 years, weekly data
-        date = fake.date_between(start_date="-6y", end_date="today")
-        # More realistic NAV progression with some volatility
-        base_nav = random.uniform(50_000_000, 2_000_000_000)
-        nav = round(base_nav * (1 + random.uniform(-0.1, 0.1)), 2)
-        c.execute(
-            "INSERT INTO FundPerformance (id, fund_id, date, nav) VALUES (?, ?, ?, ?)",
-            (performance_id, fund_id, date, nav),
-        )
-        performance_id += 1
-
-# lease renewals
-print("Creating lease renewals...")
-renewal_id = 1
-for lease in c.execute(
-    'SELECT id, rent, end_date FROM Lease WHERE end_date < date("now")'
-):
-    lease_id, current_rent, end_date = lease
-    if random.random() < 0.6:  # 60% of expired leases get renewed
-        # Convert string date to date object
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date()
-        renewal_date = fake.date_between(start_date=end_date_obj, end_date="today")
-        new_rent = round(current_rent * random.uniform(1.0, 1.15), 2)  # 0-15% increase
-        new_end_date = fake.date_between(start_date=renewal_date, end_date="+2y")
-        renewal_terms = random.choice(
-            [
-                "Standard renewal",
-                "Early renewal discount",
-                "Rent increase applied",
-                "Extended term",
-            ]
-        )
-
-        c.execute(
-            """INSERT INTO LeaseRenewal 
-                     (id, lease_id, renewal_date, new_rent, new_end_date, renewal_terms) 
-                     VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                renewal_id,
-                lease_id,
-                renewal_date,
-                new_rent,
-                new_end_date,
-                renewal_terms,
-            ),
-        )
-        renewal_id += 1
-
-# insurance
-print("Creating insurance data...")
-insurance_id = 1
-for property_id in range(1, 5001):
-    num_policies = random.randint(1, 3)  # 1-3 insurance policies per property
-    insurance_types = ["Property", "Liability", "Flood", "Earthquake", "Umbrella"]
-    for _ in range(num_policies):
-        insurance_type = random.choice(insurance_types)
-        provider = fake.company()
-        policy_number = fake.bothify(text="POL-#######")
-        start_date = fake.date_between(start_date="-3y", end_date="today")
-        end_date = fake.date_between(start_date=start_date, end_date="+1y")
-        premium_amount = round(random.uniform(500, 15000), 2)
-        coverage_amount = round(random.uniform(100000, 10000000), 2)
-
-        c.execute(
-            """INSERT INTO Insurance 
-                     (id, property_id, insurance_type, provider, policy_number, start_date, end_date, premium_amount, coverage_amount) 
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
+                )
+                market_id += 1
+
+
+def property_amenity_rows(sizes):
+    amenity_id = 1
+    for property_id in range(1, sizes["properties"] + 1):
+        num_amenities = random.randint(2, 8)  # 2-8 amenities per property
+        selected = random.sample(range(1, len(amenities_data) + 1), num_amenities)
+        for amenity_db_id in selected:
+            is_available = random.choice([True, True, True, False])  # 75% available
+            additional_cost = 0
+            if random.random() < 0.3:  # 30% have additional cost
+                additional_cost = round(random.uniform(10, 200), 2)
+            yield (amenity_id, property_id, amenity_db_id, is_available, additional_cost)
+            amenity_id += 1
+
+
+def fund_performance_rows(sizes):
+    performance_id = 1
+    for fund_id in range(1, sizes["funds"] + 1):
+        for _ in range(0, 2190, 7):  # 6 years, weekly data
+            perf_date = fake.date_between(start_date="-6y", end_date="today")
+            # more realistic NAV progression with some volatility
+            base_nav = random.uniform(50_000_000, 2_000_000_000)
+            nav = round(base_nav * (1 + random.uniform(-0.1, 0.1)), 2)
+            yield (performance_id, fund_id, perf_date, nav)
+            performance_id += 1
+
+
+def lease_renewal_rows(leases):
+    renewal_id = 1
+    today = date.today()
+    for lease_id, _, _, _, end_date, current_rent, _ in leases:
+        if end_date >= today:
+            continue
+        if random.random() < 0.6:  # 60% of expired leases get renewed
+            renewal_date = fake.date_between(start_date=end_date, end_date="today")
+            new_rent = round(current_rent * random.uniform(1.0, 1.15), 2)  # 0-15% increase
+            new_end_date = fake.date_between(start_date=renewal_date, end_date="+2y")
+            renewal_terms = random.choice(renewal_terms_options)
+            yield (renewal_id, lease_id, renewal_date, new_rent, new_end_date, renewal_terms)
+            renewal_id += 1
+
+
+def insurance_rows(sizes):
+    insurance_id = 1
+    for property_id in range(1, sizes["properties"] + 1):
+        for _ in range(random.randint(1, 3)):  # 1-3 insurance policies per property
+            insurance_type = random.choice(insurance_types)
+            provider = fake.company()
+            policy_number = fake.bothify(text="POL-#######")
+            start_date = fake.date_between(start_date="-3y", end_date="today")
+            end_date = fake.date_between(start_date=start_date, end_date="+1y")
+            premium_amount = round(random.uniform(500, 15000), 2)
+            coverage_amount = round(random.uniform(100000, 10000000), 2)
+            yield (
                 insurance_id,
                 property_id,
                 insurance_type,
@@ -874,9 +850,471 @@ for property_id in range(1, 5001):
                 end_date,
                 premium_amount,
                 coverage_amount,
-            ),
+            )
+            insurance_id += 1
+
+
+def generate_tables(scale=1.0, seed_value=None, leases=None):
+    """Yield (table, rows) for every table in load order.
+
+    rows is an iterator of tuples in `columns[table]` order. Leases are kept
+    in memory because payments and renewals are derived from them; pass the
+    already-loaded leases to reuse them instead of generating new ones.
+
+    With seed_value, random and Faker are reseeded from it before each table,
+    so any table can be regenerated without replaying the ones before it
+    (which is what lets an interrupted build resume part way through).
+    """
+    sizes = scaled_sizes(scale)
+
+    def start(phase):
+        if seed_value is not None:
+            seed(f"{seed_value}:{phase}")
+
+    start("markets")
+    markets = market_locations(sizes)
+    start("Fund")
+    yield "Fund", fund_rows(sizes)
+    start("Property")
+    yield "Property", property_rows(sizes, markets)
+    start("Tenant")
+    yield "Tenant", tenant_rows(sizes)
+    start("PropertyManager")
+    yield "PropertyManager", property_manager_rows(sizes)
+    start("PropertyManagerAssignment")
+    yield "PropertyManagerAssignment", property_manager_assignment_rows(sizes)
+    start("Vendor")
+    yield "Vendor", vendor_rows(sizes)
+    start("Amenity")
+    yield "Amenity", amenity_rows(sizes)
+    start("Lease")
+    if leases is None:
+        # filled in as the Lease rows are consumed, before payments are needed
+        leases = []
+        yield "Lease", _collect(lease_rows(sizes), leases)
+    else:
+        yield "Lease", iter(leases)
+    start("Payment")
+    yield "Payment", payment_rows(leases)
+    start("MaintenanceRequest")
+    yield "MaintenanceRequest", maintenance_request_rows(sizes)
+    start("Expense")
+    yield "Expense", expense_rows(sizes)
+    start("PropertyDocument")
+    yield "PropertyDocument", property_document_rows(sizes)
+    start("Inspection")
+    yield "Inspection", inspection_rows(sizes)
+    start("Utility")
+    yield "Utility", utility_rows(sizes)
+    start("TenantHistory")
+    yield "TenantHistory", tenant_history_rows(sizes)
+    start("MarketData")
+    yield "MarketData", market_data_rows(markets)
+    start("PropertyAmenity")
+    yield "PropertyAmenity", property_amenity_rows(sizes)
+    start("FundPerformance")
+    yield "FundPerformance", fund_performance_rows(sizes)
+    start("LeaseRenewal")
+    yield "LeaseRenewal", lease_renewal_rows(leases)
+    start("Insurance")
+    yield "Insurance", insurance_rows(sizes)
+
+
+def _collect(rows, into):
+    for row in rows:
+        into.append(row)
+        yield row
+
+
+def load_leases(conn):
+    """Read loaded leases back in the shape lease_rows() yields"""
+    rows = conn.execute(f"SELECT {', '.join(columns['Lease'])} FROM Lease ORDER BY id")
+    return [
+        (lease_id, property_id, tenant_id, date.fromisoformat(start), date.fromisoformat(end), rent, deposit)
+        for lease_id, property_id, tenant_id, start, end, rent, deposit in rows
+    ]
+
+
+def insert_sql(table):
+    names = columns[table]
+    placeholders = ", ".join("?" for _ in names)
+    return f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})"
+
+
+def create_schema(conn, scale=1.0, seed_value=0):
+    """Drop and recreate every table and start a new checkpoint record"""
+    c = conn.cursor()
+    print("Dropping existing tables...")
+    drop_search_indexes(conn)
+    drop_market_index(conn)
+    drop_alert_tables(conn)
+    c.execute("DROP TABLE IF EXISTS BuildCheckpoint")
+    # only a finished build carries the generator version
+    c.execute("PRAGMA user_version = 0")
+    for table in tables_to_drop:
+        c.execute(f"DROP TABLE IF EXISTS {table}")
+
+    # incremental auto-vacuum lets maintain.py hand free pages back to the OS;
+    # on a file created without it the setting only sticks after a VACUUM
+    c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if c.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.commit()
+        c.execute("VACUUM")
+
+    print("Creating new tables...")
+    for ddl in schema:
+        c.execute(ddl)
+    c.execute(checkpoint_schema)
+    c.execute(
+        """INSERT INTO BuildCheckpoint (phase, scale, seed, rows, completed, updated_at)
+        VALUES ('schema', ?, ?, 0, 1, datetime('now'))""",
+        (scale, seed_value),
+    )
+    conn.commit()
+
+
+def record_checkpoint(conn, phase, rows, completed):
+    """Record progress for phase and commit it together with the rows loaded so far"""
+    conn.execute(
+        """INSERT OR REPLACE INTO BuildCheckpoint (phase, scale, seed, rows, completed, updated_at)
+        SELECT ?, scale, seed, ?, ?, datetime('now') FROM BuildCheckpoint WHERE phase = 'schema'""",
+        (phase, rows, completed),
+    )
+    conn.commit()
+
+
+def load_checkpoints(conn):
+    """Return (scale, seed, {phase: (rows, completed)}) for an interrupted
+    build, or None if target has no usable checkpoint record
+    """
+    try:
+        rows = conn.execute(
+            "SELECT phase, scale, seed, rows, completed FROM BuildCheckpoint"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    phases = {phase: (count, bool(completed)) for phase, _, _, count, completed in rows}
+    if "schema" not in phases:
+        return None
+    _, scale, seed_value, _, _ = next(row for row in rows if row[0] == "schema")
+    return scale, seed_value, phases
+
+
+def new_progress(phases, expected):
+    return {
+        "phases": phases,
+        "phase": 0,
+        "expected": expected,
+        "loaded": 0,
+        "started": time.perf_counter(),
+        "phase_started": None,
+        "phase_rows": 0,
+        "last_report": 0.0,
+    }
+
+
+def start_phase(progress, label, done=0):
+    progress["phase"] += 1
+    progress["phase_started"] = time.perf_counter()
+    progress["phase_rows"] = 0
+    progress["last_report"] = progress["phase_started"]
+    progress["loaded"] += done
+    resumed = f" (resuming at row {done:,})" if done else ""
+    print(f"[{progress['phase']}/{progress['phases']}] Creating {label}...{resumed}")
+
+
+def advance_phase(progress, table, done, rows):
+    """Count rows just inserted and print a progress line if one is due"""
+    progress["phase_rows"] += rows
+    progress["loaded"] += rows
+    now = time.perf_counter()
+    if now - progress["last_report"] < PROGRESS_INTERVAL:
+        return
+    progress["last_report"] = now
+    rate = progress["phase_rows"] / (now - progress["phase_started"])
+    expected = max(progress["expected"].get(table, done), done)
+    overall_rate = progress["loaded"] / (now - progress["started"])
+    remaining = max(sum(progress["expected"].values()) - progress["loaded"], 0)
+    print(
+        f"    {done:,} / ~{expected:,.0f} rows, {rate:,.0f} rows/s, "
+        f"table ETA {(expected - done) / rate:.0f}s, load ETA {remaining / overall_rate:.0f}s"
+    )
+
+
+def finish_phase(progress, rows=None):
+    elapsed = time.perf_counter() - progress["phase_started"]
+    if rows is None:
+        print(f"    done in {elapsed:.1f}s")
+    else:
+        rate = progress["phase_rows"] / elapsed if elapsed else 0
+        print(f"    {rows:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def populate(
+    conn,
+    scale=1.0,
+    batch_size=BATCH_SIZE,
+    seed_value=None,
+    checkpoint_rows=CHECKPOINT_ROWS,
+    phases=None,
+    progress=None,
+    profile=None,
+):
+    """Generate sample data with Faker and insert it in batches.
+
+    Every checkpoint_rows rows the work so far is committed along with the
+    table's BuildCheckpoint row. phases ({phase: (rows, completed)} from
+    load_checkpoints) skips finished tables and the rows already loaded
+    into a partly loaded one; that needs the seed the build started with.
+    profile (from profiling.new_profile) collects per-table timings.
+    """
+    phases = phases or {}
+    sizes = scaled_sizes(scale)
+    if progress is None:
+        progress = new_progress(len(columns), expected_rows(sizes))
+    leases = load_leases(conn) if phases.get("Lease", (0, False))[1] else None
+
+    c = conn.cursor()
+    for table, rows in generate_tables(scale, seed_value, leases):
+        done, completed = phases.get(table, (0, False))
+        if completed:
+            progress["phase"] += 1
+            progress["loaded"] += done
+            print(f"[{progress['phase']}/{progress['phases']}] {table} already loaded")
+            continue
+        start_phase(progress, f"{table} data", done)
+        if profile is not None:
+            start_profile_phase(profile, table)
+        sql = insert_sql(table)
+        rows = islice(rows, done, None)
+        since_checkpoint = 0
+        while True:
+            started = time.perf_counter()
+            values_before = profile["value_seconds"] if profile is not None else 0.0
+            batch = list(islice(rows, batch_size))
+            generated = time.perf_counter()
+            if profile is not None:
+                values = profile["value_seconds"] - values_before
+                add_time(profile, "generate values", values)
+                add_time(profile, "assemble rows", generated - started - values)
+            if not batch:
+                break
+            c.executemany(sql, batch)
+            written = time.perf_counter()
+            done += len(batch)
+            since_checkpoint += len(batch)
+            if since_checkpoint >= checkpoint_rows:
+                record_checkpoint(conn, table, done, False)
+                since_checkpoint = 0
+            if profile is not None:
+                add_time(profile, "write", written - generated)
+                add_time(profile, "commit", time.perf_counter() - written)
+            advance_phase(progress, table, done, len(batch))
+        committing = time.perf_counter()
+        record_checkpoint(conn, table, done, True)
+        if profile is not None:
+            add_time(profile, "commit", time.perf_counter() - committing)
+            end_profile_phase(profile, done)
+        finish_phase(progress, done)
+
+
+def create_indexes(conn, phases=None, progress=None, profile=None):
+    """Build the secondary structures that sit on top of the loaded tables"""
+    phases = phases or {}
+    if progress is None:
+        progress = new_progress(len(INDEX_PHASES), {})
+    for phase, label, build in INDEX_PHASES:
+        if phases.get(phase, (0, False))[1]:
+            progress["phase"] += 1
+            print(f"[{progress['phase']}/{progress['phases']}] {label} already built")
+            continue
+        start_phase(progress, label)
+        if profile is not None:
+            start_profile_phase(profile, phase)
+        started = time.perf_counter()
+        build(conn)
+        record_checkpoint(conn, phase, 0, True)
+        if profile is not None:
+            add_time(profile, INDEX_CATEGORY, time.perf_counter() - started)
+            end_profile_phase(profile)
+        finish_phase(progress)
+
+
+def start_build(conn, scale, seed_value):
+    """Recreate the schema for a new build and return its phases record,
+    holding back change capture on the tables that had it
+    """
+    # cdc imports this module for the table list, so it is imported here
+    import cdc
+
+    phases = {}
+    captured = cdc.captured_tables(conn)
+    create_schema(conn, scale, seed_value)
+    if captured:
+        # consumers get a reset record per table rather than a log
+        # that looks as if nothing changed
+        first = cdc.mark_rebuild(conn, captured)
+        record_checkpoint(conn, CAPTURE_PHASE, first, False)
+        phases[CAPTURE_PHASE] = (first, False)
+    return phases
+
+
+def finish_build(conn, phases):
+    """Re-enable change capture held back by start_build() and stamp the
+    generator version on the finished database
+    """
+    import cdc
+
+    since, captured_done = phases.get(CAPTURE_PHASE, (0, True))
+    if not captured_done:
+        captured = cdc.reset_tables(conn, since)
+        cdc.enable_cdc(conn, captured)
+        record_checkpoint(conn, CAPTURE_PHASE, since, True)
+        print(f"Change capture re-enabled on {len(captured)} tables")
+    conn.execute(f"PRAGMA user_version = {GENERATOR_VERSION}")
+
+
+def build_database(
+    target=DB_PATH,
+    scale=1.0,
+    seed_value=None,
+    resume=False,
+    checkpoint_rows=CHECKPOINT_ROWS,
+    profile=None,
+):
+    """Create and populate the database at target and return the open connection.
+
+    target may be ":memory:" or a shared-cache URI, in which case the data
+    only lives as long as the returned connection (or another connection to
+    the same URI) stays open.
+
+    With resume, an interrupted build of target is continued from its last
+    checkpoint, using the scale and seed it was started with; if target has
+    no checkpoint record a new build is started.
+
+    profile (from profiling.new_profile) collects per-phase timings; Faker
+    and random calls are timed for the duration of the build.
+    """
+    global fake, random
+
+    if not is_memory(target) and not is_uri(target):
+        directory = os.path.dirname(target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    conn = connect(target)
+    untimed = fake, random
+    if profile is not None:
+        # route value generation through timers so it can be told apart
+        # from the row assembly around it
+        fake, random = TimedCalls(fake, profile), TimedCalls(random, profile)
+    try:
+        state = load_checkpoints(conn) if resume else None
+        if state:
+            scale, seed_value, phases = state
+            print(f"Resuming build (scale {scale:g}, seed {seed_value})...")
+        else:
+            # a build always has a seed so it can be resumed
+            if seed_value is None:
+                seed_value = random.randrange(2**31)
+            phases = start_build(conn, scale, seed_value)
+
+        sizes = scaled_sizes(scale)
+        progress = new_progress(len(columns) + len(INDEX_PHASES), expected_rows(sizes))
+        populate(
+            conn, scale, BATCH_SIZE, seed_value, checkpoint_rows, phases, progress, profile
         )
-        insurance_id += 1
+        create_indexes(conn, phases, progress, profile)
+        finish_build(conn, phases)
+        elapsed = time.perf_counter() - progress["started"]
+        print(f"Built {progress['loaded']:,} rows in {elapsed:.1f}s")
+    except BaseException:
+        conn.close()
+        raise
+    finally:
+        fake, random = untimed
+    return conn
+
+
+def golden_path(scale=1.0, seed_value=42):
+    return os.path.join(
+        GOLDEN_DIR, f"real_estate_v{GENERATOR_VERSION}_sf{scale:g}_seed{seed_value}.db"
+    )
+
 
-conn.commit()
-conn.close()
+def built_version(path):
+    """GENERATOR_VERSION of the finished build at path, or 0"""
+    if not os.path.exists(path):
+        return 0
+    conn = connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def golden_copy(scale=1.0, seed_value=42, target=":memory:"):
+    """Return a connection on target restored from a cached on-disk build.
+
+    The golden file is generated once per (generator version, scale, seed),
+    and rebuilt if it is not a finished build of this version; later calls
+    only copy its pages with the backup API, which is what test fixtures want.
+    """
+    path = golden_path(scale, seed_value)
+    if built_version(path) != GENERATOR_VERSION:
+        build_database(path, scale, seed_value).close()
+    return load_snapshot(path, target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the real estate sample database")
+    parser.add_argument(
+        "--db",
+        default=DB_PATH,
+        help="database file, :memory: or file: URI to (re)create",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="scale factor applied to row counts"
+    )
+    parser.add_argument("--seed", type=int, help="seed for a reproducible build")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted build from its last checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-rows",
+        type=int,
+        default=CHECKPOINT_ROWS,
+        help="rows committed per checkpoint",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="time each phase and write the profile (collapsed stacks) to DIR",
+    )
+    parser.add_argument(
+        "--cprofile", action="store_true", help="with --profile, dump cProfile stats per phase"
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="with --profile, record peak memory and a tracemalloc snapshot per phase",
+    )
+    args = parser.parse_args()
+    if (args.cprofile or args.tracemalloc) and not args.profile:
+        parser.error("--cprofile and --tracemalloc need --profile DIR")
+
+    profile = None
+    if args.profile:
+        profile = new_profile(args.profile, args.cprofile, args.tracemalloc)
+    build_database(
+        args.db, args.scale, args.seed, args.resume, args.checkpoint_rows, profile
+    ).close()
+    if profile is not None:
+        print_summary(profile)
+        print(f"\nCollapsed stacks written to {write_folded(profile)}")
+
+
+if __name__ == "__main__":
+    main()
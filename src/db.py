@@ -0,0 +1,118 @@
+"""
+Connection helpers for the Real Estate Database
+A target is a file path, ":memory:" or a "file:" URI such as
+"file:fixtures?mode=memory&cache=shared" (a named in-memory database shared by
+every connection in the process that opens the same URI)
+"""
+
+import sqlite3
+
+DB_PATH = "database/real_estate.db"
+
+# PRAGMAs for read-heavy connections: memory-map the file so reads skip the
+# copy into SQLite's page cache, keep a larger cache for what is not mapped,
+# build temp b-trees in memory and let big sorts use helper threads
+READ_PROFILE = {
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative means KiB
+    "temp_store": "MEMORY",
+    "threads": 4,
+}
+
+
+def is_uri(target):
+    return target.startswith("file:")
+
+
+def is_memory(target):
+    """True when target never touches disk"""
+    return target == ":memory:" or (is_uri(target) and "mode=memory" in target)
+
+
+def connect(target=DB_PATH, **kwargs):
+    """Open a connection on any supported target"""
+    return sqlite3.connect(target, uri=is_uri(target), **kwargs)
+
+
+def has_column(conn, table, column):
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def apply_read_profile(conn, **overrides):
+    """Apply READ_PROFILE to conn, with any non-None overrides, and return the
+    settings used
+    """
+    profile = dict(READ_PROFILE)
+    profile.update((name, value) for name, value in overrides.items() if value is not None)
+    for name, value in profile.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return profile
+
+
+def connect_read(target=DB_PATH, profile=None, **kwargs):
+    """Open a connection for querying with the read profile applied"""
+    conn = connect(target, **kwargs)
+    apply_read_profile(conn, **(profile or {}))
+    return conn
+
+
+def add_read_profile_args(parser):
+    """Add the read-profile options shared by the query tools to an argparse parser"""
+    group = parser.add_argument_group("read profile")
+    group.add_argument("--mmap-size", type=int, help="bytes to memory-map")
+    group.add_argument("--cache-size", type=int, help="page cache (pages, or -KiB)")
+    group.add_argument("--threads", type=int, help="helper threads for sorting")
+    group.add_argument("--warm-up", action="store_true", help="read hot b-trees first")
+
+
+def read_profile_from_args(args):
+    return {"mmap_size": args.mmap_size, "cache_size": args.cache_size, "threads": args.threads}
+
+
+def warm_up(conn, tables=None):
+    """Read every page of tables (default: all) and their indexes so the first
+    queries do not have to fault them in; returns the names read
+    """
+    objects = conn.execute(
+        """SELECT type, name, tbl_name FROM sqlite_master
+        WHERE type IN ('table', 'index') AND rootpage > 0
+        ORDER BY tbl_name, type DESC, name"""
+    ).fetchall()
+    warmed = []
+    for kind, name, table in objects:
+        if tables is not None and table not in tables:
+            continue
+        if kind == "table":
+            # NOT INDEXED makes count(*) walk the table itself rather than
+            # the smallest index
+            conn.execute(f'SELECT COUNT(*) FROM "{name}" NOT INDEXED').fetchone()
+        else:
+            conn.execute(f'SELECT COUNT(*) FROM "{table}" INDEXED BY "{name}"').fetchone()
+        warmed.append(name)
+    return warmed
+
+
+def load_snapshot(source, target=":memory:"):
+    """Copy source (a target or an open connection) into a new connection on
+    target with the online backup API and return it
+    """
+    dest = connect(target)
+    if isinstance(source, sqlite3.Connection):
+        source.backup(dest)
+        return dest
+
+    src = connect(source)
+    try:
+        src.backup(dest)
+    finally:
+        src.close()
+    return dest
+
+
+def save_snapshot(conn, target):
+    """Write the contents of conn to target (usually a file on disk)"""
+    dest = connect(target)
+    try:
+        conn.backup(dest)
+    finally:
+        dest.close()
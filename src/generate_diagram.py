@@ -6,6 +6,8 @@ Uses ERAlchemy to generate visual database diagram diagrams
 import os
 import sys
 
+from db import DB_PATH, connect_read
+
 try:
     from eralchemy import render_er
 
@@ -84,18 +86,16 @@ def generate_diagram():
             print(f"  - {file_name} ({size:,} bytes)")
 
 
-def print_table_info():
+def print_table_info(db_path=DB_PATH, profile=None):
     """Print information about tables in the database"""
-    import sqlite3
-
-    db_path = "database/real_estate.db"
 
     if not os.path.exists(db_path):
         print(f"Database file '{db_path}' not found.")
         return
 
     try:
-        conn = sqlite3.connect(db_path)
+        # row counts scan every table, so use the read profile
+        conn = connect_read(db_path, profile)
         cursor = conn.cursor()
 
         # get all table names
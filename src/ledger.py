@@ -0,0 +1,207 @@
+"""
+Tenant ledgers for the Real Estate Database
+Leases, renewals and payments for a whole batch of tenants come back from
+one statement each, with the tenant ids (and payment cursors) passed as a
+single JSON parameter. Payment carries its lease's tenant_id, which writers
+supply on insert (write_load.py resolves it from the lease) and triggers keep
+in step when payments or leases are reassigned. It is indexed on (tenant_id,
+payment_date), so a page of payments is a seek to the tenant's keyset cursor
+on (payment_date, id) followed by reading exactly the rows returned, however
+long the history
+
+    python src/ledger.py 1 2 3 --limit 20 --pages 3
+"""
+
+import argparse
+import json
+import time
+
+from db import DB_PATH, connect, has_column
+
+# payments returned per tenant unless a limit is given
+PAGE_SIZE = 50
+
+# a cursor before every payment; dates are stored as ISO text
+START = ("", 0)
+
+LEDGER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_lease_tenant ON Lease (tenant_id)",
+    "CREATE INDEX IF NOT EXISTS idx_leaserenewal_lease ON LeaseRenewal (lease_id, renewal_date)",
+    "CREATE INDEX IF NOT EXISTS idx_payment_tenant ON Payment (tenant_id, payment_date)",
+]
+
+# Payment.tenant_id follows payments moved to another lease and leases that
+# change tenant. Writers that set it on insert (write_load.py) skip the
+# insert trigger and its second write; it fills the column in for the rest
+LEDGER_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS ledger_payment_insert AFTER INSERT ON Payment
+WHEN new.tenant_id IS NULL BEGIN
+    UPDATE Payment SET tenant_id = (SELECT tenant_id FROM Lease WHERE id = new.lease_id)
+    WHERE id = new.id;
+END""",
+    """CREATE TRIGGER IF NOT EXISTS ledger_payment_lease AFTER UPDATE OF lease_id ON Payment BEGIN
+    UPDATE Payment SET tenant_id = (SELECT tenant_id FROM Lease WHERE id = new.lease_id)
+    WHERE id = new.id;
+END""",
+    """CREATE TRIGGER IF NOT EXISTS ledger_lease_tenant AFTER UPDATE OF tenant_id ON Lease BEGIN
+    UPDATE Payment SET tenant_id = new.tenant_id WHERE lease_id = new.id;
+END""",
+]
+
+LEASES_SQL = """
+SELECT l.tenant_id, l.id, l.property_id, l.start_date, l.end_date, l.rent, l.deposit
+FROM json_each(?) AS ids
+JOIN Lease l ON l.tenant_id = ids.value
+ORDER BY l.tenant_id, l.start_date, l.id
+"""
+
+RENEWALS_SQL = """
+SELECT l.tenant_id, r.lease_id, r.id, r.renewal_date, r.new_rent, r.new_end_date
+FROM json_each(?) AS ids
+JOIN Lease l ON l.tenant_id = ids.value
+JOIN LeaseRenewal r ON r.lease_id = l.id
+ORDER BY l.tenant_id, r.renewal_date, r.id
+"""
+
+# the correlated subquery reads each tenant's next :limit payment ids from
+# idx_payment_tenant; MATERIALIZED keeps the cursors from being re-read out
+# of the JSON text on every probe
+PAYMENTS_SQL = """
+WITH page(tenant_id, after_date, after_id) AS MATERIALIZED (
+    SELECT value ->> 0, value ->> 1, value ->> 2 FROM json_each(:cursors)
+)
+SELECT c.tenant_id, p.payment_date, p.id, p.lease_id, p.amount
+FROM page c
+JOIN Payment p ON p.id IN (
+    SELECT id FROM Payment
+    WHERE tenant_id = c.tenant_id AND (payment_date, id) > (c.after_date, c.after_id)
+    ORDER BY payment_date, id
+    LIMIT :limit
+)
+ORDER BY c.tenant_id, p.payment_date, p.id
+"""
+
+
+def create_ledger_index(conn):
+    """Add and backfill Payment.tenant_id and create the ledger indexes and
+    the triggers that keep tenant_id current
+    """
+    c = conn.cursor()
+    if not has_column(conn, "Payment", "tenant_id"):
+        c.execute("ALTER TABLE Payment ADD COLUMN tenant_id INTEGER REFERENCES Tenant(id)")
+    # only rows whose tenant differs are written, so a rebuild of a current
+    # index changes nothing (and logs nothing under change capture)
+    c.execute(
+        """UPDATE Payment SET tenant_id = (
+        SELECT tenant_id FROM Lease WHERE Lease.id = Payment.lease_id
+    )
+    WHERE tenant_id IS NOT (SELECT tenant_id FROM Lease WHERE Lease.id = Payment.lease_id)"""
+    )
+    # earlier versions filled tenant_id in after every insert, unguarded
+    c.execute("DROP TRIGGER IF EXISTS ledger_payment_insert")
+    for ddl in LEDGER_INDEXES + LEDGER_TRIGGERS:
+        c.execute(ddl)
+    conn.commit()
+
+
+def tenant_leases(conn, tenant_ids):
+    """(tenant_id, lease_id, property_id, start_date, end_date, rent, deposit)
+    rows for every lease of tenant_ids
+    """
+    return conn.execute(LEASES_SQL, (json.dumps(list(tenant_ids)),)).fetchall()
+
+
+def tenant_renewals(conn, tenant_ids):
+    """(tenant_id, lease_id, renewal_id, renewal_date, new_rent, new_end_date)
+    rows for every renewal of tenant_ids' leases
+    """
+    return conn.execute(RENEWALS_SQL, (json.dumps(list(tenant_ids)),)).fetchall()
+
+
+def tenant_payments(conn, cursors, limit=PAGE_SIZE):
+    """The next limit payments of each tenant after its cursor as (tenant_id,
+    payment_date, payment_id, lease_id, amount) rows.
+
+    cursors maps tenant id -> (payment_date, payment_id) of the last payment
+    already seen, or None for the first page.
+    """
+    page = []
+    for tenant_id, cursor in cursors.items():
+        after_date, after_id = cursor or START
+        page.append([tenant_id, str(after_date), after_id])
+    return conn.execute(PAYMENTS_SQL, {"cursors": json.dumps(page), "limit": limit}).fetchall()
+
+
+def next_cursors(payments, limit=PAGE_SIZE):
+    """Cursors for the tenants whose page was full and may have more payments"""
+    counts = {}
+    last = {}
+    for tenant_id, payment_date, payment_id, _, _ in payments:
+        counts[tenant_id] = counts.get(tenant_id, 0) + 1
+        last[tenant_id] = (payment_date, payment_id)
+    return {tenant_id: last[tenant_id] for tenant_id, n in counts.items() if n == limit}
+
+
+def ledger(conn, tenant_ids, limit=PAGE_SIZE):
+    """First ledger page of tenant_ids: (leases, renewals, payments, cursors),
+    the cursors being what tenant_payments() takes for the next page
+    """
+    tenant_ids = list(tenant_ids)
+    payments = tenant_payments(conn, dict.fromkeys(tenant_ids), limit)
+    return (
+        tenant_leases(conn, tenant_ids),
+        tenant_renewals(conn, tenant_ids),
+        payments,
+        next_cursors(payments, limit),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lease, renewal and payment history of tenants")
+    parser.add_argument("tenant_ids", type=int, nargs="+", help="tenants to fetch")
+    parser.add_argument("--db", default=DB_PATH, help="database to query")
+    parser.add_argument("--limit", type=int, default=PAGE_SIZE, help="payments per tenant per page")
+    parser.add_argument("--pages", type=int, default=1, help="payment pages to fetch")
+    parser.add_argument("--rebuild", action="store_true", help="recreate the ledger index first")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.rebuild or not has_column(conn, "Payment", "tenant_id"):
+            create_ledger_index(conn)
+        start = time.perf_counter()
+        leases, renewals, payments, cursors = ledger(conn, args.tenant_ids, args.limit)
+        elapsed = time.perf_counter() - start
+        print(f"{len(leases):,} leases, {len(renewals):,} renewals")
+        for tenant_id, lease_id, property_id, start_date, end_date, rent, _ in leases:
+            print(
+                f"  tenant {tenant_id:<6} lease #{lease_id:<8} property {property_id:<6}"
+                f" {start_date} - {end_date}  {rent:>10,.2f}"
+            )
+        for tenant_id, lease_id, _, renewal_date, new_rent, new_end_date in renewals:
+            print(
+                f"  tenant {tenant_id:<6} lease #{lease_id:<8} renewed {renewal_date}"
+                f" to {new_end_date}  {new_rent:>10,.2f}"
+            )
+
+        page = 1
+        while True:
+            print(f"\nPage {page}: {len(payments):,} payments in {elapsed:.3f}s")
+            for tenant_id, payment_date, payment_id, lease_id, amount in payments:
+                print(
+                    f"  tenant {tenant_id:<6} {payment_date}  #{payment_id:<9}"
+                    f" lease #{lease_id:<8} {amount:>10,.2f}"
+                )
+            if page == args.pages or not cursors:
+                break
+            page += 1
+            start = time.perf_counter()
+            payments = tenant_payments(conn, cursors, args.limit)
+            cursors = next_cursors(payments, args.limit)
+            elapsed = time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Maintenance tool for the Real Estate Database
+Hot backups with the online backup API, compacted snapshots with VACUUM INTO
+and periodic PRAGMA optimize / incremental_vacuum runs
+
+    python src/maintain.py backup database/replica.db
+    python src/maintain.py snapshot database/snapshot.db
+    python src/maintain.py optimize --every 3600
+"""
+
+import argparse
+import os
+import time
+
+from db import DB_PATH, connect
+
+# pages copied per backup step; the source is only locked while a step runs
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.05
+
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def report(action, seconds, **figures):
+    details = ", ".join(f"{key.replace('_', ' ')}: {value:,}" for key, value in figures.items())
+    print(f"{action} finished in {seconds:.2f}s ({details})")
+
+
+def backup(source, dest, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP):
+    """Copy source to dest in page-sized steps so readers and writers on the
+    source are never blocked for more than one step
+    """
+    start = time.perf_counter()
+    steps = 0
+
+    def progress(status, remaining, total):
+        nonlocal steps
+        steps += 1
+        done = total - remaining
+        print(f"  {done:,}/{total:,} pages copied", end="\r")
+
+    src = connect(source)
+    dst = connect(dest)
+    try:
+        src.backup(dst, pages=pages, progress=progress, sleep=sleep)
+        page_size = src.execute("PRAGMA page_size").fetchone()[0]
+        page_count = src.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        dst.close()
+        src.close()
+    print()
+    report(
+        "Backup",
+        time.perf_counter() - start,
+        bytes_copied=page_size * page_count,
+        steps=steps,
+    )
+
+
+def snapshot(source, dest):
+    """Write a compacted copy of source to dest with VACUUM INTO"""
+    if os.path.exists(dest):
+        raise FileExistsError(f"VACUUM INTO needs a new file, '{dest}' already exists")
+    start = time.perf_counter()
+    conn = connect(source)
+    try:
+        conn.execute("VACUUM INTO ?", (dest,))
+    finally:
+        conn.close()
+    before = file_size(source)
+    after = file_size(dest)
+    report(
+        "Snapshot",
+        time.perf_counter() - start,
+        source_bytes=before,
+        snapshot_bytes=after,
+        bytes_reclaimed=before - after,
+    )
+
+
+def optimize(target):
+    """Run PRAGMA optimize and release free pages with incremental_vacuum"""
+    start = time.perf_counter()
+    conn = connect(target)
+    try:
+        before = file_size(target)
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute("PRAGMA optimize")
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if auto_vacuum == 2:
+            # the pragma frees one page per step; executescript steps it to the end
+            conn.executescript("PRAGMA incremental_vacuum")
+        else:
+            print("auto_vacuum is not INCREMENTAL, free pages are kept until VACUUM")
+        conn.commit()
+        after = file_size(target)
+    finally:
+        conn.close()
+    report(
+        "Optimize",
+        time.perf_counter() - start,
+        free_pages=free_pages,
+        bytes_reclaimed=before - after,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the real estate database")
+    parser.add_argument("--db", default=DB_PATH, help="database to maintain")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup_cmd = commands.add_parser("backup", help="online incremental backup")
+    backup_cmd.add_argument("dest", help="backup file")
+    backup_cmd.add_argument("--pages", type=int, default=BACKUP_PAGES, help="pages per step")
+    backup_cmd.add_argument(
+        "--sleep", type=float, default=BACKUP_SLEEP, help="seconds between steps"
+    )
+
+    snapshot_cmd = commands.add_parser("snapshot", help="compacted copy via VACUUM INTO")
+    snapshot_cmd.add_argument("dest", help="snapshot file (must not exist)")
+
+    optimize_cmd = commands.add_parser("optimize", help="PRAGMA optimize and incremental_vacuum")
+    optimize_cmd.add_argument(
+        "--every", type=float, help="repeat every N seconds until interrupted"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "backup":
+        backup(args.db, args.dest, args.pages, args.sleep)
+    elif args.command == "snapshot":
+        snapshot(args.db, args.dest)
+    elif args.command == "optimize":
+        while True:
+            optimize(args.db)
+            if not args.every:
+                break
+            time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Market lookup index joining Property to MarketData
+City and state text is normalized into MarketState/MarketCity dimension
+tables; Property and MarketData both carry the integer market_key, and
+MarketData is indexed on (market_key, property_type, date) so the latest
+comps for any batch of properties come back from one indexed join
+
+    python src/market.py 1 2 3
+"""
+
+import argparse
+import json
+
+from db import DB_PATH, connect, has_column
+
+
+def drop_market_index(conn):
+    conn.execute("DROP TABLE IF EXISTS MarketCity")
+    conn.execute("DROP TABLE IF EXISTS MarketState")
+
+
+def create_market_index(conn):
+    """Create and backfill the dimension tables and market_key columns"""
+    c = conn.cursor()
+    drop_market_index(conn)
+    c.execute(
+        """CREATE TABLE MarketState (
+        id INTEGER PRIMARY KEY,
+        code TEXT NOT NULL UNIQUE
+    )"""
+    )
+    c.execute(
+        """CREATE TABLE MarketCity (
+        id INTEGER PRIMARY KEY,
+        state_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        UNIQUE(state_id, name),
+        FOREIGN KEY(state_id) REFERENCES MarketState(id)
+    )"""
+    )
+
+    c.execute(
+        """INSERT INTO MarketState (code)
+        SELECT state FROM Property WHERE state IS NOT NULL
+        UNION
+        SELECT state FROM MarketData WHERE state IS NOT NULL
+        ORDER BY 1"""
+    )
+    c.execute(
+        """INSERT INTO MarketCity (state_id, name)
+        SELECT s.id, locations.city
+        FROM (
+            SELECT city, state FROM Property
+            UNION
+            SELECT city, state FROM MarketData
+        ) AS locations
+        JOIN MarketState s ON s.code = locations.state
+        WHERE locations.city IS NOT NULL
+        ORDER BY s.id, locations.city"""
+    )
+
+    for table in ("Property", "MarketData"):
+        if not has_column(conn, table, "market_key"):
+            c.execute(
+                f"ALTER TABLE {table} ADD COLUMN market_key INTEGER REFERENCES MarketCity(id)"
+            )
+        key = f"""(
+            SELECT mc.id
+            FROM MarketState ms
+            JOIN MarketCity mc ON mc.state_id = ms.id AND mc.name = {table}.city
+            WHERE ms.code = {table}.state
+        )"""
+        # the dimension ids are assigned in a fixed order, so a rebuild over
+        # unchanged locations writes no rows
+        c.execute(f"UPDATE {table} SET market_key = {key} WHERE market_key IS NOT {key}")
+
+    c.execute(
+        """CREATE INDEX IF NOT EXISTS idx_marketdata_market
+        ON MarketData (market_key, property_type, date)"""
+    )
+    c.execute("ANALYZE MarketData")
+    conn.commit()
+
+
+# latest MarketData row per (market_key, property_type); the ORDER BY ... LIMIT 1
+# subquery is answered from the tail of idx_marketdata_market
+COMPS_SQL = """
+SELECT p.id, p.market_key, p.type, m.id, m.date, m.avg_price_per_sqft,
+       m.vacancy_rate, m.rental_yield, m.appreciation_rate
+FROM {properties}
+LEFT JOIN MarketData m ON m.id = (
+    SELECT latest.id
+    FROM MarketData latest
+    WHERE latest.market_key = p.market_key AND latest.property_type = p.type
+    ORDER BY latest.date DESC, latest.id DESC
+    LIMIT 1
+)
+ORDER BY p.id
+"""
+
+
+def latest_comps(conn, property_ids=None):
+    """Return the latest market comps for property_ids (every property when
+    None) as (property_id, market_key, type, market_data_id, date,
+    avg_price_per_sqft, vacancy_rate, rental_yield, appreciation_rate) rows.
+
+    The market columns are None for properties outside a covered market.
+    """
+    if property_ids is None:
+        return conn.execute(COMPS_SQL.format(properties="Property p")).fetchall()
+
+    # the whole batch travels as one JSON array parameter
+    sql = COMPS_SQL.format(properties="json_each(?) AS ids JOIN Property p ON p.id = ids.value")
+    return conn.execute(sql, (json.dumps(list(property_ids)),)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latest market comps for properties")
+    parser.add_argument("property_ids", type=int, nargs="*", help="properties (default: all)")
+    parser.add_argument("--db", default=DB_PATH, help="database to query")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recreate the market index first"
+    )
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.rebuild:
+            create_market_index(conn)
+        rows = latest_comps(conn, args.property_ids or None)
+        for property_id, market_key, ptype, _, comp_date, price, vacancy, *_ in rows:
+            if comp_date is None:
+                print(f"property {property_id} ({ptype}): no market data")
+            else:
+                print(
+                    f"property {property_id} ({ptype}): market {market_key} as of {comp_date}, "
+                    f"${price:,.2f}/sqft, vacancy {vacancy:.1%}"
+                )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Build profiling for create_db.py
+Splits the time of every build phase into generating values (Faker and
+random calls), assembling rows around them, writing batches and committing,
+optionally with a cProfile dump and a tracemalloc snapshot per phase. The
+split is written as collapsed stacks, which flamegraph.pl and speedscope
+read directly, and printed as a summary table
+
+    python src/create_db.py --scale 0.1 --seed 42 --profile profiles --cprofile
+"""
+
+import cProfile
+import os
+import time
+import tracemalloc
+
+# time categories of a table phase, in pipeline order
+CATEGORIES = ("generate values", "assemble rows", "write", "commit")
+
+# category used for the index phases, which are a single SQL step each
+INDEX_CATEGORY = "build index"
+
+FOLDED_NAME = "build.folded"
+
+
+def new_profile(output_dir, cprofile=False, trace_memory=False):
+    os.makedirs(output_dir, exist_ok=True)
+    return {
+        "dir": output_dir,
+        "cprofile": cprofile,
+        "tracemalloc": trace_memory,
+        "phases": {},
+        "value_seconds": 0.0,
+        "current": None,
+        "profiler": None,
+    }
+
+
+class TimedCalls:
+    """Stands in for a module or object and adds the time spent in each call
+    to profile["value_seconds"]
+    """
+
+    def __init__(self, target, profile):
+        self._target = target
+        self._profile = profile
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        profile = self._profile
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                profile["value_seconds"] += time.perf_counter() - start
+
+        return timed
+
+
+def start_profile_phase(profile, phase):
+    profile["current"] = phase
+    profile["phases"][phase] = {
+        "rows": 0,
+        "seconds": dict.fromkeys(CATEGORIES + (INDEX_CATEGORY,), 0.0),
+        "started": time.perf_counter(),
+        "total": 0.0,
+        "peak_bytes": None,
+    }
+    if profile["tracemalloc"]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    if profile["cprofile"]:
+        profile["profiler"] = cProfile.Profile()
+        profile["profiler"].enable()
+
+
+def add_time(profile, category, seconds):
+    profile["phases"][profile["current"]]["seconds"][category] += seconds
+
+
+def end_profile_phase(profile, rows=0):
+    """Close the current phase and write its cProfile / tracemalloc files"""
+    phase = profile["current"]
+    stats = profile["phases"][phase]
+    if profile["profiler"] is not None:
+        profile["profiler"].disable()
+        profile["profiler"].dump_stats(os.path.join(profile["dir"], f"{phase}.prof"))
+        profile["profiler"] = None
+    stats["total"] = time.perf_counter() - stats["started"]
+    stats["rows"] = rows
+    if profile["tracemalloc"]:
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.take_snapshot().dump(os.path.join(profile["dir"], f"{phase}.tracemalloc"))
+    profile["current"] = None
+
+
+def write_folded(profile, path=None):
+    """Write 'build;phase;category microseconds' lines and return the path"""
+    path = path or os.path.join(profile["dir"], FOLDED_NAME)
+    with open(path, "w") as f:
+        for phase, stats in profile["phases"].items():
+            for category, seconds in stats["seconds"].items():
+                micros = round(seconds * 1_000_000)
+                if micros:
+                    f.write(f"build;{phase};{category} {micros}\n")
+            # whatever the categories do not cover (progress output, seeding)
+            other = round((stats["total"] - sum(stats["seconds"].values())) * 1_000_000)
+            if other > 0:
+                f.write(f"build;{phase};other {other}\n")
+    return path
+
+
+def print_summary(profile):
+    header = "".join(f"{name:>16}" for name in CATEGORIES)
+    print(f"\n{'phase':<28}{'rows':>10}{header}{'total':>10}{'rows/s':>11}{'peak MiB':>10}")
+    totals = dict.fromkeys(CATEGORIES, 0.0)
+    for phase, stats in profile["phases"].items():
+        seconds = stats["seconds"]
+        cells = "".join(f"{seconds[name]:>15.2f}s" for name in CATEGORIES)
+        if seconds[INDEX_CATEGORY]:
+            cells = f"{INDEX_CATEGORY + ' ' + format(seconds[INDEX_CATEGORY], '.2f') + 's':>64}"
+        rate = f"{stats['rows'] / stats['total']:>11,.0f}" if stats["rows"] else f"{'':>11}"
+        peak = stats["peak_bytes"]
+        peak_text = f"{peak / 2**20:>10.1f}" if peak is not None else f"{'':>10}"
+        print(f"{phase:<28}{stats['rows']:>10,}{cells}{stats['total']:>9.2f}s{rate}{peak_text}")
+        for name in CATEGORIES:
+            totals[name] += seconds[name]
+    overall = sum(stats["total"] for stats in profile["phases"].values())
+    cells = "".join(f"{totals[name]:>15.2f}s" for name in CATEGORIES)
+    print(f"{'all phases':<28}{'':>10}{cells}{overall:>9.2f}s")
+    if profile["cprofile"] or profile["tracemalloc"]:
+        print("(cProfile and tracemalloc slow every category down; compare shares, not seconds)")
@@ -0,0 +1,260 @@
+"""
+Standard analytical query workload for the Real Estate Database
+Each entry is (name, sql); the statements take no parameters so they can be
+replayed as-is by the benchmark harness
+"""
+
+WORKLOAD = [
+    (
+        "average_lease_term",
+        """
+SELECT AVG(julianday(end_date) - julianday(start_date)) AS average_lease_term FROM Lease
+""",
+    ),
+    (
+        "rent_roll_by_fund",
+        """
+SELECT f.id, f.name, COUNT(l.id) AS active_leases, SUM(l.rent) AS monthly_rent
+FROM Fund f
+JOIN Property p ON p.fund_id = f.id
+JOIN Lease l ON l.property_id = p.id
+WHERE l.start_date <= date('now') AND l.end_date >= date('now')
+GROUP BY f.id
+ORDER BY monthly_rent DESC
+""",
+    ),
+    (
+        "delinquency_last_90_days",
+        """
+WITH live AS (
+    SELECT id, property_id, rent, start_date,
+           MAX(start_date, date('now', '-90 days')) AS from_date,
+           MIN(end_date, date('now')) AS to_date
+    FROM Lease
+    WHERE start_date <= date('now') AND end_date >= date('now', '-90 days')
+),
+due AS (
+    -- rent falls due on the lease's start day of each month
+    SELECT *,
+           strftime('%Y', to_date) * 12 + strftime('%m', to_date)
+           - strftime('%Y', from_date) * 12 - strftime('%m', from_date) + 1
+           - (strftime('%d', from_date) > strftime('%d', start_date))
+           - (strftime('%d', to_date) < strftime('%d', start_date)) AS months
+    FROM live
+)
+SELECT d.property_id, d.id AS lease_id, d.rent,
+       COALESCE(SUM(pay.amount), 0) AS paid, COUNT(pay.id) AS payments
+FROM due d
+LEFT JOIN Payment pay ON pay.lease_id = d.id
+    AND pay.payment_date >= date('now', '-90 days') AND pay.payment_date <= date('now')
+GROUP BY d.id
+HAVING COALESCE(SUM(pay.amount), 0) < d.rent * d.months
+ORDER BY d.rent * d.months - COALESCE(SUM(pay.amount), 0) DESC
+""",
+    ),
+    (
+        "vendor_spend",
+        """
+SELECT v.id, v.name, v.category, COUNT(e.id) AS invoices, SUM(e.amount) AS spend
+FROM Vendor v
+JOIN Expense e ON e.vendor_id = v.id
+GROUP BY v.id
+ORDER BY spend DESC
+""",
+    ),
+    (
+        "maintenance_sla_by_priority",
+        """
+SELECT priority, COUNT(*) AS completed,
+       AVG(julianday(completed_date) - julianday(created_date)) AS avg_days_to_close,
+       MAX(julianday(completed_date) - julianday(created_date)) AS max_days_to_close
+FROM MaintenanceRequest
+WHERE status = 'Completed'
+GROUP BY priority
+""",
+    ),
+    (
+        "insurance_expiring_90_days",
+        """
+SELECT i.id, i.property_id, p.address, i.insurance_type, i.provider, i.end_date
+FROM Insurance i
+JOIN Property p ON p.id = i.property_id
+WHERE i.end_date BETWEEN date('now') AND date('now', '+90 days')
+ORDER BY i.end_date
+""",
+    ),
+    (
+        "top_tenants_by_rent_paid",
+        """
+SELECT t.id, t.name, SUM(pay.amount) AS total_paid
+FROM Tenant t
+JOIN Lease l ON l.tenant_id = t.id
+JOIN Payment pay ON pay.lease_id = l.id
+GROUP BY t.id
+ORDER BY total_paid DESC
+LIMIT 20
+""",
+    ),
+    (
+        "occupancy_by_property_type",
+        """
+SELECT p.type, COUNT(*) AS properties,
+       SUM(EXISTS (
+           SELECT 1 FROM Lease l
+           WHERE l.property_id = p.id
+             AND l.start_date <= date('now') AND l.end_date >= date('now')
+       )) AS occupied
+FROM Property p
+GROUP BY p.type
+""",
+    ),
+    (
+        "monthly_expenses_by_category",
+        """
+SELECT strftime('%Y-%m', expense_date) AS month, category, SUM(amount) AS total
+FROM Expense
+WHERE expense_date >= date('now', '-12 months')
+GROUP BY month, category
+ORDER BY month, category
+""",
+    ),
+    (
+        "open_maintenance_by_manager",
+        """
+SELECT pm.id, pm.name, COUNT(mr.id) AS open_requests,
+       SUM(mr.estimated_cost) AS estimated_backlog
+FROM PropertyManager pm
+JOIN MaintenanceRequest mr ON mr.manager_id = pm.id
+WHERE mr.status IN ('Open', 'In Progress')
+GROUP BY pm.id
+ORDER BY open_requests DESC
+""",
+    ),
+    (
+        "documents_expiring_90_days",
+        """
+SELECT id, property_id, document_type, document_name, expiry_date
+FROM PropertyDocument
+WHERE expiry_date BETWEEN date('now') AND date('now', '+90 days')
+ORDER BY expiry_date
+""",
+    ),
+    (
+        "inspections_due_30_days",
+        """
+SELECT id, property_id, inspection_type, next_inspection_date
+FROM Inspection
+WHERE next_inspection_date BETWEEN date('now') AND date('now', '+30 days')
+ORDER BY next_inspection_date
+""",
+    ),
+    (
+        "fund_latest_nav",
+        """
+SELECT fund_id, date, nav
+FROM (
+    SELECT fund_id, date, nav,
+           ROW_NUMBER() OVER (PARTITION BY fund_id ORDER BY date DESC) AS rn
+    FROM FundPerformance
+)
+WHERE rn = 1
+ORDER BY fund_id
+""",
+    ),
+    (
+        "market_price_by_type",
+        """
+SELECT property_type, AVG(avg_price_per_sqft) AS avg_price_per_sqft,
+       AVG(vacancy_rate) AS vacancy_rate, AVG(rental_yield) AS rental_yield
+FROM MarketData
+WHERE date >= date('now', '-1 year')
+GROUP BY property_type
+""",
+    ),
+    (
+        "renewal_uplift_by_property_type",
+        """
+SELECT p.type, COUNT(*) AS renewals, AVG(r.new_rent / l.rent - 1) AS avg_uplift
+FROM LeaseRenewal r
+JOIN Lease l ON l.id = r.lease_id
+JOIN Property p ON p.id = l.property_id
+GROUP BY p.type
+""",
+    ),
+    (
+        "rent_by_credit_band",
+        """
+SELECT (th.credit_score / 50) * 50 AS credit_band, COUNT(DISTINCT l.tenant_id) AS tenants,
+       AVG(l.rent) AS avg_rent
+FROM TenantHistory th
+JOIN Lease l ON l.tenant_id = th.tenant_id
+GROUP BY credit_band
+ORDER BY credit_band
+""",
+    ),
+    (
+        "utility_cost_by_type",
+        """
+SELECT utility_type, is_tenant_responsibility, COUNT(*) AS accounts,
+       SUM(monthly_average) AS monthly_total
+FROM Utility
+GROUP BY utility_type, is_tenant_responsibility
+""",
+    ),
+    (
+        "amenity_revenue",
+        """
+SELECT a.name, COUNT(pa.id) AS properties, SUM(pa.additional_cost) AS monthly_revenue
+FROM Amenity a
+JOIN PropertyAmenity pa ON pa.amenity_id = a.id
+WHERE pa.is_available
+GROUP BY a.id
+ORDER BY monthly_revenue DESC
+""",
+    ),
+    (
+        "manager_portfolio_value",
+        """
+SELECT pm.id, pm.name, COUNT(pma.property_id) AS properties, SUM(p.value) AS portfolio_value
+FROM PropertyManager pm
+JOIN PropertyManagerAssignment pma ON pma.manager_id = pm.id AND pma.end_date IS NULL
+JOIN Property p ON p.id = pma.property_id
+GROUP BY pm.id
+ORDER BY portfolio_value DESC
+""",
+    ),
+    (
+        "monthly_collections",
+        """
+SELECT strftime('%Y-%m', payment_date) AS month, COUNT(*) AS payments, SUM(amount) AS collected
+FROM Payment
+WHERE payment_date >= date('now', '-24 months') AND payment_date <= date('now')
+GROUP BY month
+ORDER BY month
+""",
+    ),
+    (
+        "property_noi_top_20",
+        """
+WITH income AS (
+    SELECT l.property_id, SUM(pay.amount) AS collected
+    FROM Payment pay
+    JOIN Lease l ON l.id = pay.lease_id
+    WHERE pay.payment_date >= date('now', '-12 months') AND pay.payment_date <= date('now')
+    GROUP BY l.property_id
+),
+costs AS (
+    SELECT property_id, SUM(amount) AS spent
+    FROM Expense
+    WHERE expense_date >= date('now', '-12 months')
+    GROUP BY property_id
+)
+SELECT p.id, p.address, COALESCE(i.collected, 0) - COALESCE(c.spent, 0) AS noi
+FROM Property p
+LEFT JOIN income i ON i.property_id = p.id
+LEFT JOIN costs c ON c.property_id = p.id
+ORDER BY noi DESC
+LIMIT 20
+""",
+    ),
+]
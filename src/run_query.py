@@ -1,12 +1,23 @@
-import sqlite3
+import argparse
+
+from db import DB_PATH, add_read_profile_args, connect_read, read_profile_from_args, warm_up
 
 # define the SQL query statement
 QUERY_STATEMENT = """
 SELECT AVG(julianday(end_date) - julianday(start_date)) AS average_lease_term FROM Lease;
 """
 
-# connect to the database
-connection = sqlite3.connect("database/real_estate.db")
+parser = argparse.ArgumentParser(description="Run the example query")
+parser.add_argument(
+    "--db", default=DB_PATH, help="database file, :memory: or file: URI to query"
+)
+add_read_profile_args(parser)
+args = parser.parse_args()
+
+# connect to the database with the read profile (mmap, cache, temp store)
+connection = connect_read(args.db, read_profile_from_args(args))
+if args.warm_up:
+    warm_up(connection, ["Lease"])
 cursor = connection.cursor()
 
 # execute the query
@@ -0,0 +1,143 @@
+"""
+Full-text search over the free-text columns of the Real Estate Database
+Each source table gets an external-content FTS5 index (the text is not stored
+twice) kept in sync by triggers; search() ranks matches with bm25 and returns
+the owning Property
+
+    python src/search.py "HVAC leak"
+"""
+
+import argparse
+import re
+
+from db import DB_PATH, connect
+
+# source table -> indexed columns
+SEARCH_INDEXES = {
+    "MaintenanceRequest": ("category", "description"),
+    "Expense": ("category", "description"),
+    "Inspection": ("notes",),
+    "PropertyDocument": ("document_name",),
+}
+
+
+def index_name(table):
+    return f"{table}Search"
+
+
+def create_search_indexes(conn):
+    """Create the FTS5 tables and sync triggers, then index existing rows"""
+    c = conn.cursor()
+    for table, cols in SEARCH_INDEXES.items():
+        fts = index_name(table)
+        col_list = ", ".join(cols)
+        new_values = ", ".join(f"new.{col}" for col in cols)
+        old_values = ", ".join(f"old.{col}" for col in cols)
+
+        c.execute(f"DROP TABLE IF EXISTS {fts}")
+        c.execute(
+            f"""CREATE VIRTUAL TABLE {fts} USING fts5(
+    {col_list},
+    content='{table}',
+    content_rowid='id'
+)"""
+        )
+        # external-content tables need the old values to remove a row
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+END"""
+        )
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+END"""
+        )
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+    INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+END"""
+        )
+        c.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        c.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+    conn.commit()
+
+
+def drop_search_indexes(conn):
+    """Drop the FTS tables; the triggers go away with their source tables"""
+    for table in SEARCH_INDEXES:
+        conn.execute(f"DROP TABLE IF EXISTS {index_name(table)}")
+
+
+def quote_query(text):
+    """Turn free text into an FTS5 query that matches every word"""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search(conn, text, limit=20, sources=None, raw=False):
+    """Return up to limit matches across the indexed tables, best first.
+
+    Each row is (source, row_id, property_id, address, snippet, score); a
+    lower score is a better match. Pass raw=True to use FTS5 query syntax
+    (OR, NEAR, prefix*) instead of matching every word.
+    """
+    query = text if raw else quote_query(text)
+    if not query:
+        return []
+
+    selects = []
+    params = []
+    for table in sources or SEARCH_INDEXES:
+        fts = index_name(table)
+        snippet_col = len(SEARCH_INDEXES[table]) - 1
+        selects.append(
+            f"""SELECT * FROM (
+    SELECT '{table}' AS source, t.id, t.property_id, p.address,
+           snippet({fts}, {snippet_col}, '[', ']', '...', 10) AS snippet,
+           bm25({fts}) AS score
+    FROM {fts}
+    JOIN {table} t ON t.id = {fts}.rowid
+    JOIN Property p ON p.id = t.property_id
+    WHERE {fts} MATCH ?
+    ORDER BY rank
+    LIMIT ?
+)"""
+        )
+        params.extend([query, limit])
+
+    sql = "\nUNION ALL\n".join(selects) + "\nORDER BY score\nLIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search descriptions, notes and documents")
+    parser.add_argument("text", help="words to search for")
+    parser.add_argument("--db", default=DB_PATH, help="database to search")
+    parser.add_argument("--limit", type=int, default=20, help="maximum results")
+    parser.add_argument(
+        "--source", action="append", choices=list(SEARCH_INDEXES), help="only search this table"
+    )
+    parser.add_argument("--raw", action="store_true", help="use FTS5 query syntax as-is")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recreate the indexes before searching"
+    )
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.rebuild:
+            create_search_indexes(conn)
+        for source, row_id, property_id, address, snippet, score in search(
+            conn, args.text, args.limit, args.source, args.raw
+        ):
+            print(f"{score:8.2f}  {source}#{row_id}  property {property_id} ({address})")
+            print(f"          {snippet}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
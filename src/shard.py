@@ -0,0 +1,363 @@
+"""
+Fund sharding for the Real Estate Database
+Splits a database into one file per fund group, holding the group's funds,
+properties and everything hanging off them, plus a shared file for tenants,
+vendors, amenities, managers and market data. Per-fund reports open only
+their own shard; portfolio-wide aggregates run on every shard in a process
+pool and the partial results are merged
+
+    python src/shard.py split --groups 5
+    python src/shard.py fund 7
+    python src/shard.py portfolio --source database/real_estate.db
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from create_db import columns, schema
+from db import DB_PATH, connect, connect_read
+
+SHARD_DIR = "database/shards"
+
+# SQLite's default SQLITE_MAX_ATTACHED; one slot goes to the shared file
+MAX_ATTACHED = 10
+
+# tables kept once for the whole portfolio
+SHARED_TABLES = ["Tenant", "Vendor", "Amenity", "PropertyManager", "TenantHistory", "MarketData"]
+
+# sharded tables in copy order with the condition that selects a group's rows;
+# children are filtered on the parents already copied into the shard (main)
+SHARD_FILTERS = {
+    "Fund": "t.id IN (SELECT fund_id FROM shard_funds)",
+    "FundPerformance": "t.fund_id IN (SELECT fund_id FROM shard_funds)",
+    "Property": "t.fund_id IN (SELECT fund_id FROM shard_funds)",
+    "PropertyManagerAssignment": "t.property_id IN (SELECT id FROM main.Property)",
+    "Lease": "t.property_id IN (SELECT id FROM main.Property)",
+    "Payment": "t.lease_id IN (SELECT id FROM main.Lease)",
+    "LeaseRenewal": "t.lease_id IN (SELECT id FROM main.Lease)",
+    "MaintenanceRequest": "t.property_id IN (SELECT id FROM main.Property)",
+    "Expense": "t.property_id IN (SELECT id FROM main.Property)",
+    "PropertyDocument": "t.property_id IN (SELECT id FROM main.Property)",
+    "Inspection": "t.property_id IN (SELECT id FROM main.Property)",
+    "Utility": "t.property_id IN (SELECT id FROM main.Property)",
+    "PropertyAmenity": "t.property_id IN (SELECT id FROM main.Property)",
+    "Insurance": "t.property_id IN (SELECT id FROM main.Property)",
+}
+
+# lookups the per-fund reports and the fan-out queries lean on
+SHARD_INDEXES = [
+    "CREATE INDEX idx_property_fund ON Property (fund_id)",
+    "CREATE INDEX idx_lease_property ON Lease (property_id)",
+    "CREATE INDEX idx_payment_lease ON Payment (lease_id, payment_date)",
+    "CREATE INDEX idx_maintenance_property ON MaintenanceRequest (property_id)",
+]
+
+# portfolio aggregates: (name, sql run on every shard, number of key columns).
+# Every other column must be a sum or count so partial results add up; an
+# average is returned as its sum and count
+PORTFOLIO_QUERIES = [
+    (
+        "rent_roll_by_fund",
+        """
+SELECT p.fund_id, COUNT(l.id), SUM(l.rent)
+FROM Property p
+JOIN Lease l ON l.property_id = p.id
+WHERE l.start_date <= date('now') AND l.end_date >= date('now')
+GROUP BY p.fund_id
+""",
+        1,
+    ),
+    (
+        "monthly_collections",
+        """
+SELECT substr(payment_date, 1, 7) AS month, COUNT(*), SUM(amount)
+FROM Payment
+WHERE payment_date >= date('now', '-24 months') AND payment_date <= date('now')
+GROUP BY month
+""",
+        1,
+    ),
+    (
+        "vendor_spend",
+        """
+SELECT vendor_id, COUNT(*), SUM(amount)
+FROM Expense
+GROUP BY vendor_id
+""",
+        1,
+    ),
+    (
+        "expenses_by_category",
+        """
+SELECT category, COUNT(*), SUM(amount)
+FROM Expense
+GROUP BY category
+""",
+        1,
+    ),
+    (
+        "maintenance_by_priority",
+        """
+SELECT priority, status, COUNT(*), SUM(estimated_cost), SUM(actual_cost)
+FROM MaintenanceRequest
+GROUP BY priority, status
+""",
+        2,
+    ),
+]
+
+# a single fund's summary, answered from its own shard
+FUND_REPORT_SQL = """
+SELECT f.id, f.name,
+       (SELECT COUNT(*) FROM Property WHERE fund_id = f.id),
+       (SELECT SUM(value) FROM Property WHERE fund_id = f.id),
+       COUNT(l.id),
+       COALESCE(SUM(l.rent), 0),
+       (SELECT COALESCE(SUM(pay.amount), 0)
+        FROM Property p
+        JOIN Lease pl ON pl.property_id = p.id
+        JOIN Payment pay ON pay.lease_id = pl.id
+        WHERE p.fund_id = f.id AND pay.payment_date >= date('now', '-12 months')),
+       (SELECT COUNT(*)
+        FROM Property p
+        JOIN MaintenanceRequest mr ON mr.property_id = p.id
+        WHERE p.fund_id = f.id AND mr.status IN ('Open', 'In Progress'))
+FROM Fund f
+LEFT JOIN Property p ON p.fund_id = f.id
+LEFT JOIN Lease l ON l.property_id = p.id
+    AND l.start_date <= date('now') AND l.end_date >= date('now')
+WHERE f.id = ?
+GROUP BY f.id
+"""
+
+
+def shard_path(shard_dir, shard):
+    return os.path.join(shard_dir, f"shard_{shard:02d}.db")
+
+
+def shared_path(shard_dir):
+    return os.path.join(shard_dir, "shared.db")
+
+
+def fund_group(fund_id, groups):
+    return (fund_id - 1) % groups
+
+
+def _create_tables(conn, tables):
+    ddl = dict(zip(columns, schema))
+    for table in tables:
+        conn.execute(ddl[table])
+
+
+def _copy(conn, table, where="1"):
+    names = ", ".join(columns[table])
+    conn.execute(
+        f"INSERT INTO main.{table} ({names}) SELECT {names} FROM src.{table} t WHERE {where}"
+    )
+
+
+def split_database(source=DB_PATH, shard_dir=SHARD_DIR, groups=5):
+    """Write the shared file and one shard per fund group for source"""
+    os.makedirs(shard_dir, exist_ok=True)
+    paths = [shared_path(shard_dir)] + [shard_path(shard_dir, g) for g in range(groups)]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    conn = connect(shared_path(shard_dir))
+    conn.execute("ATTACH DATABASE ? AS src", (source,))
+    print("Creating shared tables...")
+    _create_tables(conn, SHARED_TABLES)
+    for table in SHARED_TABLES:
+        _copy(conn, table)
+    conn.execute("CREATE TABLE ShardMap (fund_id INTEGER PRIMARY KEY, shard INTEGER NOT NULL)")
+    fund_ids = [fund_id for (fund_id,) in conn.execute("SELECT id FROM src.Fund ORDER BY id")]
+    conn.executemany(
+        "INSERT INTO ShardMap (fund_id, shard) VALUES (?, ?)",
+        [(fund_id, fund_group(fund_id, groups)) for fund_id in fund_ids],
+    )
+    conn.commit()
+    conn.execute("DETACH DATABASE src")
+    conn.close()
+
+    for group in range(groups):
+        print(f"Creating shard {group}...")
+        conn = connect(shard_path(shard_dir, group))
+        conn.execute("ATTACH DATABASE ? AS src", (source,))
+        conn.execute("CREATE TEMP TABLE shard_funds (fund_id INTEGER PRIMARY KEY)")
+        conn.executemany(
+            "INSERT INTO shard_funds VALUES (?)",
+            [(fund_id,) for fund_id in fund_ids if fund_group(fund_id, groups) == group],
+        )
+        _create_tables(conn, SHARD_FILTERS)
+        for table, where in SHARD_FILTERS.items():
+            _copy(conn, table, where)
+        for ddl in SHARD_INDEXES:
+            conn.execute(ddl)
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+        conn.close()
+
+
+def shard_map(shard_dir=SHARD_DIR):
+    """fund id -> shard number"""
+    conn = connect(shared_path(shard_dir))
+    try:
+        return dict(conn.execute("SELECT fund_id, shard FROM ShardMap"))
+    finally:
+        conn.close()
+
+
+def open_shard(shard, shard_dir=SHARD_DIR):
+    """Connection on one shard with the shared tables attached as 'shared';
+    unqualified names such as Tenant resolve to the shared copy
+    """
+    conn = connect_read(shard_path(shard_dir, shard))
+    conn.execute("ATTACH DATABASE ? AS shared", (shared_path(shard_dir),))
+    return conn
+
+
+def open_fund(fund_id, shard_dir=SHARD_DIR):
+    """Connection on the only shard that holds fund_id"""
+    shards = shard_map(shard_dir)
+    if fund_id not in shards:
+        raise KeyError(f"fund {fund_id} is not in {shard_dir}")
+    return open_shard(shards[fund_id], shard_dir)
+
+
+def open_funds(fund_ids, shard_dir=SHARD_DIR):
+    """Connection on the shared file with the shards holding fund_ids
+    attached and TEMP views named after each sharded table that union them,
+    so ordinary queries run unchanged; the views hold every fund in those
+    shards, so filter on fund_id when only fund_ids are wanted
+    """
+    mapping = shard_map(shard_dir)
+    shards = sorted({mapping[fund_id] for fund_id in fund_ids})
+    if len(shards) > MAX_ATTACHED - 1:
+        raise ValueError(
+            f"{len(shards)} shards requested, only {MAX_ATTACHED - 1} can be attached; "
+            "use fan_out() for portfolio-wide queries"
+        )
+    conn = connect_read(shared_path(shard_dir))
+    for shard in shards:
+        conn.execute(f"ATTACH DATABASE ? AS s{shard}", (shard_path(shard_dir, shard),))
+    for table in SHARD_FILTERS:
+        union = " UNION ALL ".join(f"SELECT * FROM s{shard}.{table}" for shard in shards)
+        conn.execute(f"CREATE TEMP VIEW {table} AS {union}")
+    return conn
+
+
+def _run_on_shard(shard_dir, shard, sql, params):
+    conn = open_shard(shard, shard_dir)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def fan_out(sql, shard_dir=SHARD_DIR, params=(), processes=None):
+    """Run sql on every shard in a process pool; returns one row list per shard"""
+    shards = sorted(set(shard_map(shard_dir).values()))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_run_on_shard, shard_dir, shard, sql, params) for shard in shards]
+        return [future.result() for future in futures]
+
+
+def merge_sums(partials, keys=1):
+    """Merge per-shard rows by their first `keys` columns, adding the rest"""
+    merged = {}
+    for rows in partials:
+        for row in rows:
+            key, values = row[:keys], row[keys:]
+            totals = merged.get(key)
+            if totals is None:
+                merged[key] = list(values)
+                continue
+            for i, value in enumerate(values):
+                if value is not None:
+                    totals[i] = value if totals[i] is None else totals[i] + value
+    return sorted(
+        (key + tuple(values) for key, values in merged.items()),
+        key=lambda row: tuple((value is None, value) for value in row[:keys]),
+    )
+
+
+def portfolio(name, shard_dir=SHARD_DIR, processes=None):
+    """Run a PORTFOLIO_QUERIES entry across every shard and merge the results"""
+    queries = {query_name: (sql, keys) for query_name, sql, keys in PORTFOLIO_QUERIES}
+    sql, keys = queries[name]
+    return merge_sums(fan_out(sql, shard_dir, processes=processes), keys)
+
+
+def fund_report(fund_id, shard_dir=SHARD_DIR):
+    """(fund id, name, properties, value, active leases, monthly rent,
+    collected last 12 months, open maintenance requests) for one fund
+    """
+    conn = open_fund(fund_id, shard_dir)
+    try:
+        return conn.execute(FUND_REPORT_SQL, (fund_id,)).fetchone()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard the database by fund")
+    parser.add_argument("--dir", default=SHARD_DIR, help="directory holding the shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split_cmd = commands.add_parser("split", help="write the shards from a database")
+    split_cmd.add_argument("--source", default=DB_PATH, help="database to split")
+    split_cmd.add_argument("--groups", type=int, default=5, help="number of fund shards")
+
+    fund_cmd = commands.add_parser("fund", help="report on one fund from its shard")
+    fund_cmd.add_argument("fund_id", type=int)
+
+    portfolio_cmd = commands.add_parser("portfolio", help="fan aggregates out over all shards")
+    portfolio_cmd.add_argument(
+        "--query", action="append", choices=[name for name, _, _ in PORTFOLIO_QUERIES]
+    )
+    portfolio_cmd.add_argument("--processes", type=int, help="worker processes")
+    portfolio_cmd.add_argument("--source", help="also time the query on this unsharded database")
+
+    args = parser.parse_args()
+
+    if args.command == "split":
+        start = time.perf_counter()
+        split_database(args.source, args.dir, args.groups)
+        print(f"Wrote {args.groups} shards to {args.dir} in {time.perf_counter() - start:.2f}s")
+    elif args.command == "fund":
+        start = time.perf_counter()
+        row = fund_report(args.fund_id, args.dir)
+        elapsed = time.perf_counter() - start
+        fund_id, name, properties, value, leases, rent, collected, open_requests = row
+        print(f"Fund {fund_id}: {name}")
+        print(f"  properties:            {properties:>16,}")
+        print(f"  portfolio value:       {value or 0:>16,.2f}")
+        print(f"  active leases:         {leases:>16,}")
+        print(f"  monthly rent roll:     {rent:>16,.2f}")
+        print(f"  collected (12 months): {collected:>16,.2f}")
+        print(f"  open maintenance:      {open_requests:>16,}")
+        print(f"\nAnswered from shard {shard_map(args.dir)[fund_id]} in {elapsed:.3f}s")
+    else:
+        for name, sql, _ in PORTFOLIO_QUERIES:
+            if args.query and name not in args.query:
+                continue
+            start = time.perf_counter()
+            rows = portfolio(name, args.dir, args.processes)
+            line = f"{name:<28}{len(rows):>6} rows  sharded {time.perf_counter() - start:.3f}s"
+            if args.source:
+                conn = connect_read(args.source)
+                try:
+                    start = time.perf_counter()
+                    conn.execute(sql).fetchall()
+                    line += f"  unsharded {time.perf_counter() - start:.3f}s"
+                finally:
+                    conn.close()
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Monthly financial statements for every property and fund
+Each source table is read once for the whole portfolio (window functions
+split lease terms and pick month-end NAV) and the rows are streamed into
+flat per-(property, month) accumulators, so the cost is one pass per table
+rather than one query per property
+
+    python src/statements.py --start 2025-01 --end 2025-12 --csv statements.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+from datetime import date
+
+from db import DB_PATH, connect
+
+PROPERTY_COLUMNS = (
+    "property_id",
+    "fund_id",
+    "month",
+    "active_leases",
+    "scheduled_rent",
+    "collected",
+    "expenses",
+    "utilities",
+    "insurance",
+    "noi",
+)
+
+FUND_COLUMNS = (
+    "fund_id",
+    "month",
+    "properties",
+    "active_leases",
+    "scheduled_rent",
+    "collected",
+    "collection_rate",
+    "expenses",
+    "utilities",
+    "insurance",
+    "noi",
+    "nav",
+    "nav_change",
+)
+
+# months are integer indexes (year * 12 + month) read straight from the ISO
+# date text, which is much cheaper than strftime() on every row
+
+
+def month_sql(column):
+    return f"substr({column}, 1, 4) * 12 + substr({column}, 6, 2)"
+
+
+# a lease is billed at its original rent until its first renewal, then at
+# each renewal's rent until the next renewal (or the renewal's own end date).
+# Each term gives up the month the next one starts in, so a lease is billed
+# once per month even when a renewal starts before the previous term ends
+TERMS_SQL = f"""
+WITH terms AS (
+    SELECT id AS lease_id, property_id, 0 AS renewal, start_date AS term_start,
+           end_date AS term_end, rent
+    FROM Lease
+    UNION ALL
+    SELECT r.lease_id, l.property_id, 1, r.renewal_date, r.new_end_date, r.new_rent
+    FROM LeaseRenewal r
+    JOIN Lease l ON l.id = r.lease_id
+)
+SELECT property_id, start_idx, end_idx, rent
+FROM (
+    SELECT property_id, rent,
+           {month_sql("term_start")} AS start_idx,
+           COALESCE(
+               MIN({month_sql("term_end")}, {month_sql("next_start")} - 1),
+               {month_sql("term_end")}
+           ) AS end_idx
+    FROM (
+        SELECT *, LEAD(term_start) OVER (
+            PARTITION BY lease_id ORDER BY term_start, renewal
+        ) AS next_start
+        FROM terms
+    )
+)
+WHERE end_idx >= :first AND start_idx <= :last AND end_idx >= start_idx
+"""
+
+# every month each lease is live in, by its original term or any renewal
+LIVE_LEASES_SQL = f"""
+SELECT id, property_id, {month_sql("start_date")}, {month_sql("end_date")}
+FROM Lease
+UNION ALL
+SELECT r.lease_id, l.property_id, {month_sql("r.renewal_date")}, {month_sql("r.new_end_date")}
+FROM LeaseRenewal r
+JOIN Lease l ON l.id = r.lease_id
+"""
+
+PAYMENTS_SQL = f"""
+SELECT lease_id, {month_sql("payment_date")}, amount
+FROM Payment
+WHERE payment_date >= :start_date AND payment_date < :end_date
+"""
+
+EXPENSES_SQL = f"""
+SELECT property_id, {month_sql("expense_date")}, amount
+FROM Expense
+WHERE expense_date >= :start_date AND expense_date < :end_date
+"""
+
+# utilities the owner pays are a flat monthly cost
+UTILITIES_SQL = """
+SELECT property_id, SUM(monthly_average)
+FROM Utility
+WHERE NOT is_tenant_responsibility
+GROUP BY property_id
+"""
+
+# premiums are spread evenly over the months a policy covers
+INSURANCE_SQL = f"""
+SELECT property_id, start_idx, end_idx, premium_amount / (end_idx - start_idx + 1)
+FROM (
+    SELECT property_id, premium_amount,
+           {month_sql("start_date")} AS start_idx,
+           {month_sql("end_date")} AS end_idx
+    FROM Insurance
+)
+WHERE end_idx >= :first AND start_idx <= :last
+"""
+
+# last NAV reported in each month, with the change from the previous report
+NAV_SQL = f"""
+SELECT fund_id, idx, nav, nav - LAG(nav) OVER (PARTITION BY fund_id ORDER BY idx)
+FROM (
+    SELECT fund_id, {month_sql("date")} AS idx, nav,
+           ROW_NUMBER() OVER (
+               PARTITION BY fund_id, substr(date, 1, 7) ORDER BY date DESC, id DESC
+           ) AS rn
+    FROM FundPerformance
+)
+WHERE rn = 1
+"""
+
+
+def month_index(text):
+    """'YYYY-MM' or 'YYYY-MM-DD' -> year * 12 + month"""
+    return int(text[:4]) * 12 + int(text[5:7])
+
+
+def month_label(idx):
+    year, month = divmod(idx - 1, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def build_statements(conn, start, end):
+    """Compute statements for the months start..end ('YYYY-MM' or dates).
+
+    Returns (property_rows, fund_rows) in PROPERTY_COLUMNS / FUND_COLUMNS
+    order, sorted by id and month.
+    """
+    first = month_index(start)
+    last = month_index(end)
+    months = last - first + 1
+    params = {
+        "first": first,
+        "last": last,
+        "start_date": f"{start[:7]}-01",
+        "end_date": f"{month_label(last + 1)}-01",
+    }
+
+    properties = conn.execute("SELECT id, fund_id FROM Property ORDER BY id").fetchall()
+    # offset of each property's first month in the flat accumulators
+    base = {property_id: i * months - first for i, (property_id, _) in enumerate(properties)}
+    size = len(properties) * months
+    active = [0] * size
+    scheduled = [0.0] * size
+    collected = [0.0] * size
+    expenses = [0.0] * size
+    insurance = [0.0] * size
+
+    for property_id, start_idx, end_idx, rent in conn.execute(TERMS_SQL, params):
+        offset = base[property_id]
+        for idx in range(max(start_idx, first), min(end_idx, last) + 1):
+            active[offset + idx] += 1
+            scheduled[offset + idx] += rent
+
+    lease_property = dict(conn.execute("SELECT id, property_id FROM Lease"))
+    for lease_id, idx, amount in conn.execute(PAYMENTS_SQL, params):
+        collected[base[lease_property[lease_id]] + idx] += amount
+
+    for property_id, idx, amount in conn.execute(EXPENSES_SQL, params):
+        expenses[base[property_id] + idx] += amount
+
+    for property_id, start_idx, end_idx, monthly in conn.execute(INSURANCE_SQL, params):
+        offset = base[property_id]
+        for idx in range(max(start_idx, first), min(end_idx, last) + 1):
+            insurance[offset + idx] += monthly
+
+    utilities = dict(conn.execute(UTILITIES_SQL))
+    nav = {(fund_id, idx): (value, change) for fund_id, idx, value, change in conn.execute(NAV_SQL)}
+
+    labels = [month_label(idx) for idx in range(first, last + 1)]
+    property_rows = []
+    funds = {}
+    for property_id, fund_id in properties:
+        offset = base[property_id]
+        monthly_utilities = utilities.get(property_id, 0.0)
+        for idx, label in enumerate(labels, first):
+            slot = offset + idx
+            noi = collected[slot] - expenses[slot] - monthly_utilities - insurance[slot]
+            row = (
+                property_id,
+                fund_id,
+                label,
+                active[slot],
+                scheduled[slot],
+                collected[slot],
+                expenses[slot],
+                monthly_utilities,
+                insurance[slot],
+                noi,
+            )
+            property_rows.append(row)
+
+            totals = funds.get((fund_id, idx))
+            if totals is None:
+                funds[(fund_id, idx)] = [1, *row[3:]]
+            else:
+                totals[0] += 1
+                for i, value in enumerate(row[3:], 1):
+                    totals[i] += value
+
+    fund_rows = []
+    for (fund_id, idx), totals in sorted(funds.items()):
+        count, leases, rent, paid, spent, utility, premium, noi = totals
+        rate = paid / rent if rent else None
+        value, change = nav.get((fund_id, idx), (None, None))
+        fund_rows.append(
+            (
+                fund_id,
+                month_label(idx),
+                count,
+                leases,
+                rent,
+                paid,
+                rate,
+                spent,
+                utility,
+                premium,
+                noi,
+                value,
+                change,
+            )
+        )
+    return property_rows, fund_rows
+
+
+def check_active_leases(conn, property_rows):
+    """Property statements whose active_leases exceeds the number of distinct
+    leases live in that month, as (property_id, month, active_leases, live)
+    """
+    live = {}
+    for lease_id, property_id, start_idx, end_idx in conn.execute(LIVE_LEASES_SQL):
+        for idx in range(start_idx, end_idx + 1):
+            live.setdefault((property_id, idx), set()).add(lease_id)
+    failures = []
+    for property_id, _, month, active, *_ in property_rows:
+        count = len(live.get((property_id, month_index(month)), ()))
+        if active > count:
+            failures.append((property_id, month, active, count))
+    return failures
+
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Monthly property and fund statements")
+    parser.add_argument("--db", default=DB_PATH, help="database to report on")
+    parser.add_argument(
+        "--start", default=f"{today.year - 1}-{today.month:02d}", help="first month (YYYY-MM)"
+    )
+    parser.add_argument(
+        "--end", default=f"{today.year}-{today.month:02d}", help="last month (YYYY-MM)"
+    )
+    parser.add_argument("--csv", help="write property statements to this CSV file")
+    parser.add_argument("--fund", type=int, help="only print this fund")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="fail if a property counts more active leases than are live",
+    )
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        start = time.perf_counter()
+        property_rows, fund_rows = build_statements(conn, args.start, args.end)
+        elapsed = time.perf_counter() - start
+        failures = check_active_leases(conn, property_rows) if args.check else []
+    finally:
+        conn.close()
+
+    print(f"{'fund':>4} {'month':<8}{'rent roll':>14}{'collected':>14}{'rate':>7}{'NOI':>14}{'NAV':>17}")
+    for row in fund_rows:
+        statement = dict(zip(FUND_COLUMNS, row))
+        if args.fund and statement["fund_id"] != args.fund:
+            continue
+        rate = statement["collection_rate"] or 0
+        nav = statement["nav"]
+        nav_text = f"{nav:>17,.0f}" if nav is not None else f"{'-':>17}"
+        print(
+            f"{statement['fund_id']:>4} {statement['month']:<8}"
+            f"{statement['scheduled_rent']:>14,.0f}{statement['collected']:>14,.0f}"
+            f"{rate:>7.1%}{statement['noi']:>14,.0f}{nav_text}"
+        )
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(PROPERTY_COLUMNS)
+            writer.writerows(property_rows)
+        print(f"\nWrote {len(property_rows):,} property statements to {args.csv}")
+
+    print(
+        f"\n{len(property_rows):,} property and {len(fund_rows):,} fund statements "
+        f"in {elapsed:.2f}s"
+    )
+    if args.check:
+        for property_id, month, active, live in failures:
+            print(f"property {property_id} {month}: {active} active leases, {live} live")
+        print(f"{len(failures):,} statements count more active leases than are live")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
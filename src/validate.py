@@ -0,0 +1,190 @@
+"""
+Data-quality validation for the Real Estate Database
+Rules are declared as data and compiled into one counting pass per table
+(every rule becomes a SUM(...) over the same scan); tables with violations
+get one extra LIMIT query per failing rule to pull sample ids
+
+    python src/validate.py
+"""
+
+import argparse
+import sys
+import time
+
+from create_db import (
+    columns,
+    maintenance_priorities,
+    maintenance_statuses,
+    property_types,
+)
+from db import DB_PATH, connect
+
+# sample ids reported per failing rule
+SAMPLE_SIZE = 5
+
+
+# rule constructors - each returns (table, rule name, SQL condition that is
+# true for a violating row of `t`)
+
+
+def foreign_key(table, column, parent):
+    return (
+        table,
+        f"{column} -> {parent}.id",
+        f"t.{column} IS NOT NULL AND NOT EXISTS (SELECT 1 FROM {parent} WHERE id = t.{column})",
+    )
+
+
+def ordered(table, first, second):
+    return (
+        table,
+        f"{first} <= {second}",
+        f"t.{first} IS NOT NULL AND t.{second} IS NOT NULL AND t.{second} < t.{first}",
+    )
+
+
+def value_range(table, column, low=None, high=None):
+    bounds = []
+    if low is not None:
+        bounds.append(f"t.{column} < {low}")
+    if high is not None:
+        bounds.append(f"t.{column} > {high}")
+    name = f"{column} in [{'' if low is None else low}, {'' if high is None else high}]"
+    return (table, name, f"t.{column} IS NOT NULL AND ({' OR '.join(bounds)})")
+
+
+def one_of(table, column, values):
+    quoted = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+    return (table, f"{column} is a known value", f"t.{column} NOT IN ({quoted})")
+
+
+def not_null(table, column):
+    return (table, f"{column} is set", f"t.{column} IS NULL")
+
+
+def check(table, name, condition):
+    return (table, name, condition)
+
+
+RULES = [
+    ordered("Lease", "start_date", "end_date"),
+    not_null("Lease", "start_date"),
+    not_null("Lease", "end_date"),
+    value_range("Lease", "rent", low=0),
+    value_range("Lease", "deposit", low=0),
+    not_null("Payment", "payment_date"),
+    value_range("Payment", "amount", low=0),
+    ordered("PropertyManagerAssignment", "start_date", "end_date"),
+    one_of("Property", "type", property_types),
+    value_range("Property", "value", low=0),
+    one_of("MaintenanceRequest", "status", maintenance_statuses),
+    one_of("MaintenanceRequest", "priority", maintenance_priorities),
+    ordered("MaintenanceRequest", "created_date", "completed_date"),
+    check(
+        "MaintenanceRequest",
+        "completed requests have completed_date and actual_cost",
+        "t.status = 'Completed' AND (t.completed_date IS NULL OR t.actual_cost IS NULL)",
+    ),
+    check(
+        "MaintenanceRequest",
+        "open requests have no completed_date or actual_cost",
+        "t.status <> 'Completed' AND (t.completed_date IS NOT NULL OR t.actual_cost IS NOT NULL)",
+    ),
+    value_range("Expense", "amount", low=0),
+    ordered("PropertyDocument", "upload_date", "expiry_date"),
+    ordered("Inspection", "inspection_date", "next_inspection_date"),
+    value_range("Vendor", "rating", low=0, high=5),
+    value_range("TenantHistory", "credit_score", low=300, high=850),
+    value_range("MarketData", "vacancy_rate", low=0, high=1),
+    ordered("LeaseRenewal", "renewal_date", "new_end_date"),
+    value_range("LeaseRenewal", "new_rent", low=0),
+    ordered("Insurance", "start_date", "end_date"),
+    check(
+        "Insurance",
+        "coverage_amount exceeds premium_amount",
+        "t.coverage_amount < t.premium_amount",
+    ),
+]
+
+
+def foreign_key_rules(conn):
+    """FK existence rules read from the schema's FOREIGN KEY clauses"""
+    rules = []
+    for table in columns:
+        for row in conn.execute(f"PRAGMA foreign_key_list({table})"):
+            parent, column = row[2], row[3]
+            rules.append(foreign_key(table, column, parent))
+    return rules
+
+
+def compile_rules(rules):
+    """Group rules by table into one counting query per table"""
+    by_table = {}
+    for table, name, condition in rules:
+        by_table.setdefault(table, []).append((name, condition))
+
+    compiled = {}
+    for table, table_rules in by_table.items():
+        sums = ",\n       ".join(
+            f"COALESCE(SUM({condition}), 0)" for _, condition in table_rules
+        )
+        compiled[table] = (
+            f"SELECT COUNT(*),\n       {sums}\nFROM {table} t",
+            table_rules,
+        )
+    return compiled
+
+
+def validate(conn, rules=None, sample_size=SAMPLE_SIZE):
+    """Run every rule and return [(table, rule, rows checked, violations, sample ids)]"""
+    rules = foreign_key_rules(conn) + (RULES if rules is None else rules)
+    results = []
+    for table, (sql, table_rules) in compile_rules(rules).items():
+        row_count, *counts = conn.execute(sql).fetchone()
+        for (name, condition), violations in zip(table_rules, counts):
+            samples = []
+            if violations:
+                samples = [
+                    row_id
+                    for (row_id,) in conn.execute(
+                        f"SELECT t.id FROM {table} t WHERE {condition} LIMIT ?",
+                        (sample_size,),
+                    )
+                ]
+            results.append((table, name, row_count, violations, samples))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the real estate database")
+    parser.add_argument("--db", default=DB_PATH, help="database to validate")
+    parser.add_argument("--all", action="store_true", help="also list passing rules")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        start = time.perf_counter()
+        results = validate(conn)
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    failed = 0
+    print(f"{'table':<28}{'rule':<58}{'violations':>12}  samples")
+    for table, name, _, violations, samples in results:
+        if violations:
+            failed += 1
+        elif not args.all:
+            continue
+        sample_text = ", ".join(str(row_id) for row_id in samples)
+        print(f"{table:<28}{name:<58}{violations:>12,}  {sample_text}")
+
+    tables = len({table for table, *_ in results})
+    print(
+        f"\n{len(results)} rules over {tables} tables in {elapsed:.2f}s, {failed} failing"
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Synthetic write load for the Real Estate Database
+Writer threads post payments, open and close maintenance tickets and renew
+leases (rows come from the create_db.py generators) while reader threads run
+portal-style queries. Reports throughput, latency, lock-wait time and
+SQLITE_BUSY retries so journal mode, busy_timeout and batching can be sized
+
+    python src/write_load.py --writers 4 --readers 4 --duration 30 --wal
+"""
+
+import argparse
+import random
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from benchmark import percentile
+from create_db import (
+    columns,
+    lease_renewal_rows,
+    maintenance_request_rows,
+    payment_rows,
+)
+from db import DB_PATH, connect, has_column
+from ledger import create_ledger_index
+
+# default share of each write operation
+DEFAULT_MIX = {"payment": 50, "open_ticket": 20, "close_ticket": 20, "renew_lease": 10}
+
+# seconds to back off after a failed attempt, doubled on each retry
+RETRY_BACKOFF = 0.001
+
+
+def load_sizes(conn):
+    """Id ranges of the existing data, in the shape the generators expect"""
+    sizes = {}
+    for key, table in [
+        ("properties", "Property"),
+        ("tenants", "Tenant"),
+        ("vendors", "Vendor"),
+        ("managers", "PropertyManager"),
+        ("leases", "Lease"),
+        ("maintenance_requests", "MaintenanceRequest"),
+    ]:
+        sizes[key] = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 1
+    return sizes
+
+
+def insert_without_id(conn, table, row):
+    """Insert a generator row and let SQLite assign the id"""
+    names = list(columns[table][1:])
+    placeholders = ", ".join("?" for _ in names)
+    values = row[1:]
+    if table == "Payment":
+        # the ledger's tenant_id, taken from the lease in the same statement
+        names.append("tenant_id")
+        placeholders += ", (SELECT tenant_id FROM Lease WHERE id = ?)"
+        values = (*values, row[columns[table].index("lease_id")])
+    conn.execute(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", values
+    )
+
+
+def random_lease(conn, sizes):
+    """First lease at or after a random id"""
+    return conn.execute(
+        "SELECT id, end_date, rent FROM Lease WHERE id >= ? ORDER BY id LIMIT 1",
+        (random.randint(1, sizes["leases"]),),
+    ).fetchone()
+
+
+def post_payment(conn, sizes):
+    lease = random_lease(conn, sizes)
+    if lease is None:
+        return
+    lease_id, _, rent = lease
+    today = date.today()
+    # a one-day lease yields exactly one payment, partial at the usual rate;
+    # a late one is still posted today rather than on its future date
+    for payment_id, lease_id, pay_date, amount in payment_rows(
+        [(lease_id, None, None, today, today, rent, None)]
+    ):
+        insert_without_id(conn, "Payment", (payment_id, lease_id, min(pay_date, today), amount))
+
+
+def open_ticket(conn, sizes):
+    generated = next(maintenance_request_rows(sizes, count=1))
+    row = dict(zip(columns["MaintenanceRequest"], generated))
+    row.update(status="Open", created_date=date.today(), completed_date=None, actual_cost=None)
+    insert_without_id(conn, "MaintenanceRequest", tuple(row.values()))
+
+
+def close_ticket(conn, sizes):
+    conn.execute(
+        """UPDATE MaintenanceRequest
+        SET status = 'Completed', completed_date = date('now'),
+            actual_cost = round(estimated_cost * (0.8 + 0.5 * ?), 2)
+        WHERE id = (
+            SELECT id FROM MaintenanceRequest
+            WHERE id >= ? AND status IN ('Open', 'In Progress')
+            ORDER BY id LIMIT 1
+        )""",
+        (random.random(), random.randint(1, sizes["maintenance_requests"])),
+    )
+
+
+def renew_lease(conn, sizes):
+    # renew from the end of the lease's latest term, original or renewed;
+    # Lease keeps its original term as in the generated data
+    lease = conn.execute(
+        """SELECT l.id, COALESCE(r.new_end_date, l.end_date), COALESCE(r.new_rent, l.rent)
+        FROM Lease l
+        LEFT JOIN LeaseRenewal r ON r.id = (
+            SELECT id FROM LeaseRenewal WHERE lease_id = l.id
+            ORDER BY renewal_date DESC, id DESC LIMIT 1
+        )
+        WHERE l.id >= ? AND COALESCE(r.new_end_date, l.end_date) < date('now')
+        ORDER BY l.id LIMIT 1""",
+        (random.randint(1, sizes["leases"]),),
+    ).fetchone()
+    if lease is None:
+        return
+    lease_id, end_date, rent = lease
+    end = date.fromisoformat(end_date)
+    # the generator skips some leases, which plays the part of a declined renewal
+    for row in lease_renewal_rows([(lease_id, None, None, None, end, rent, None)]):
+        insert_without_id(conn, "LeaseRenewal", row)
+
+
+WRITE_OPS = {
+    "payment": post_payment,
+    "open_ticket": open_ticket,
+    "close_ticket": close_ticket,
+    "renew_lease": renew_lease,
+}
+
+READ_QUERIES = {
+    "lease_payments": (
+        "SELECT payment_date, amount FROM Payment WHERE lease_id = ? ORDER BY payment_date",
+        "leases",
+    ),
+    "property_open_tickets": (
+        """SELECT id, category, priority FROM MaintenanceRequest
+        WHERE property_id = ? AND status IN ('Open', 'In Progress')""",
+        "properties",
+    ),
+    "tenant_leases": (
+        "SELECT id, start_date, end_date, rent FROM Lease WHERE tenant_id = ?",
+        "tenants",
+    ),
+}
+
+
+def is_busy(error):
+    message = str(error)
+    return "locked" in message or "busy" in message
+
+
+def new_stats():
+    return {"latencies": {}, "lock_wait": 0.0, "busy_retries": 0, "errors": 0}
+
+
+def run_transaction(conn, body, stats, begin):
+    """Run body() in a transaction, retrying on SQLITE_BUSY; returns the time
+    spent waiting for locks (including failed attempts)
+    """
+    backoff = RETRY_BACKOFF
+    waited = 0.0
+    while True:
+        attempt_start = time.perf_counter()
+        try:
+            conn.execute(begin)
+            waited += time.perf_counter() - attempt_start
+            body()
+            conn.execute("COMMIT")
+            return waited
+        except BaseException as e:
+            # whatever body() raised, the connection is handed back outside
+            # a transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if not isinstance(e, sqlite3.OperationalError) or not is_busy(e):
+                raise
+            stats["busy_retries"] += 1
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 0.1)
+            waited += time.perf_counter() - attempt_start
+
+
+def writer(target, mix, batch, busy_timeout, sizes, deadline, stats):
+    conn = connect(target, timeout=busy_timeout, isolation_level=None)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    try:
+        while time.perf_counter() < deadline:
+            chosen = random.choices(names, weights, k=batch)
+
+            def body():
+                for name in chosen:
+                    WRITE_OPS[name](conn, sizes)
+
+            start = time.perf_counter()
+            try:
+                # take the write lock up front so the wait is measured in one place
+                stats["lock_wait"] += run_transaction(conn, body, stats, "BEGIN IMMEDIATE")
+            except sqlite3.Error:
+                stats["errors"] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            for name in chosen:
+                stats["latencies"].setdefault(name, []).append(elapsed / batch)
+    finally:
+        conn.close()
+
+
+def reader(target, busy_timeout, sizes, deadline, stats):
+    conn = connect(target, timeout=busy_timeout, isolation_level=None)
+    names = list(READ_QUERIES)
+    try:
+        while time.perf_counter() < deadline:
+            name = random.choice(names)
+            sql, id_range = READ_QUERIES[name]
+            param = random.randint(1, sizes[id_range])
+
+            def body():
+                # a deferred BEGIN takes no lock; the shared lock is taken on
+                # the first step, so the busy handler's wait for it is timed
+                # there (along with producing the first row)
+                first_step = time.perf_counter()
+                cursor = conn.execute(sql, (param,))
+                cursor.fetchone()
+                stats["lock_wait"] += time.perf_counter() - first_step
+                cursor.fetchall()
+
+            start = time.perf_counter()
+            try:
+                # body() adds its own wait, so the BEGIN wait is added after it
+                waited = run_transaction(conn, body, stats, "BEGIN")
+            except sqlite3.Error:
+                stats["errors"] += 1
+                continue
+            stats["lock_wait"] += waited
+            stats["latencies"].setdefault(name, []).append(time.perf_counter() - start)
+    finally:
+        conn.close()
+
+
+def report(kind, all_stats, duration):
+    latencies = {}
+    for stats in all_stats:
+        for name, samples in stats["latencies"].items():
+            latencies.setdefault(name, []).extend(samples)
+    total_ops = sum(len(samples) for samples in latencies.values())
+    lock_wait = sum(stats["lock_wait"] for stats in all_stats)
+    retries = sum(stats["busy_retries"] for stats in all_stats)
+    errors = sum(stats["errors"] for stats in all_stats)
+
+    print(f"\n{kind} ({len(all_stats)} threads): {total_ops / duration:,.0f} ops/s")
+    print(f"  lock wait: {lock_wait:.2f}s total, busy retries: {retries:,}, failed: {errors:,}")
+    for name in sorted(latencies):
+        samples = latencies[name]
+        print(
+            f"  {name:<24}{len(samples):>9,} ops"
+            f"{percentile(samples, 50) * 1000:>10.2f} ms p50"
+            f"{percentile(samples, 95) * 1000:>10.2f} ms p95"
+        )
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        if name not in WRITE_OPS:
+            raise ValueError(f"unknown operation '{name}', expected one of {list(WRITE_OPS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def run_load(
+    target=DB_PATH,
+    writers=4,
+    readers=4,
+    duration=10.0,
+    mix=None,
+    batch=1,
+    busy_timeout=5.0,
+    wal=False,
+):
+    """Run the load for duration seconds and print the report"""
+    conn = connect(target)
+    try:
+        if wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if not has_column(conn, "Payment", "tenant_id"):
+            # payments are written with the ledger's tenant_id
+            create_ledger_index(conn)
+        sizes = load_sizes(conn)
+    finally:
+        conn.close()
+
+    print(
+        f"journal_mode={journal_mode}, busy_timeout={busy_timeout}s, batch={batch}, "
+        f"{writers} writers, {readers} readers, {duration:g}s"
+    )
+    deadline = time.perf_counter() + duration
+    writer_stats = [new_stats() for _ in range(writers)]
+    reader_stats = [new_stats() for _ in range(readers)]
+    threads = [
+        threading.Thread(
+            target=writer,
+            args=(target, mix or DEFAULT_MIX, batch, busy_timeout, sizes, deadline, stats),
+        )
+        for stats in writer_stats
+    ] + [
+        threading.Thread(target=reader, args=(target, busy_timeout, sizes, deadline, stats))
+        for stats in reader_stats
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if writers:
+        report("Writers", writer_stats, elapsed)
+    if readers:
+        report("Readers", reader_stats, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent writes and reads")
+    parser.add_argument("--db", default=DB_PATH, help="database file or file: URI")
+    parser.add_argument("--writers", type=int, default=4, help="writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="reader threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help="operation weights, e.g. payment=50,open_ticket=20,close_ticket=20,renew_lease=10",
+    )
+    parser.add_argument("--batch", type=int, default=1, help="operations per transaction")
+    parser.add_argument(
+        "--busy-timeout", type=float, default=5.0, help="seconds SQLite waits on a lock"
+    )
+    parser.add_argument("--wal", action="store_true", help="switch the database to WAL first")
+    args = parser.parse_args()
+
+    run_load(
+        args.db,
+        args.writers,
+        args.readers,
+        args.duration,
+        args.mix,
+        args.batch,
+        args.busy_timeout,
+        args.wal,
+    )
+
+
+if __name__ == "__main__":
+    main()